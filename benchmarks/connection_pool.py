@@ -0,0 +1,88 @@
+"""
+Load test a cheap endpoint with and without the database connection pool.
+
+Each mode runs in a fresh interpreter with DB_POOL set accordingly and
+sends requests from several threads at once, then prints p50/p99
+latency. Run from the project root against Postgres:
+
+    python benchmarks/connection_pool.py --threads 8 --requests 200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+URL = "/api/station/journeys/?page_size=1"
+
+
+def child(url, threads, requests):
+    from utils import api_client, percentile, setup_django
+
+    setup_django()
+
+    from django.db import connections
+
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        client = api_client()
+        local = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(url)
+            local.append((time.perf_counter() - started) * 1000)
+        connections.close_all()
+        with lock:
+            samples.extend(local)
+
+    api_client().get(url)
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"  GET {url} x{len(samples)} from {threads} threads: "
+        f"p50={statistics.median(samples):.2f}ms "
+        f"p99={percentile(samples, 0.99):.2f}ms "
+        f"{len(samples) / elapsed:.0f} req/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=URL)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per thread")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.url, args.threads, args.requests)
+        return
+
+    for pool in ("False", "True"):
+        print(f"DB_POOL={pool}")
+        subprocess.run(
+            [
+                sys.executable, __file__, "--child",
+                "--url", args.url,
+                "--threads", str(args.threads),
+                "--requests", str(args.requests),
+            ],
+            # One pooled connection per thread, like a worker with that many threads.
+            env={**os.environ, "DB_POOL": pool, "GUNICORN_THREADS": str(args.threads)},
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark the journey search filters against a seeded database.
+
+Seed at least a million journeys first:
+
+    python manage.py seed_journeys --journeys 1000000
+
+then run from the project root:
+
+    python benchmarks/journey_search.py --repeat 200
+"""
+
+import argparse
+import sys
+from datetime import timedelta
+
+from utils import api_client, measure, setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from stations.models import Journey  # noqa: E402
+
+JOURNEY_URL = "/api/station/journeys/"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    journey = Journey.objects.select_related("route").order_by("?").first()
+    if journey is None:
+        sys.exit("No journeys found, run `manage.py seed_journeys` first")
+
+    client = api_client()
+    day = journey.departure_time.replace(hour=0, minute=0, second=0, microsecond=0)
+    params = {
+        "source": journey.route.source_id,
+        "destination": journey.route.destination_id,
+        "departure_after": day.isoformat(),
+        "departure_before": (day + timedelta(days=1)).isoformat(),
+    }
+
+    print(f"Journeys in table: {Journey.objects.count()}")
+    print(f"Query params: {params}")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(JOURNEY_URL, params)
+    assert response.status_code == 200, response.status_code
+    search_sql = next(
+        query["sql"] for query in queries if query["sql"].startswith('SELECT "stations_journey"')
+    )
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN ANALYZE {search_sql}")
+            print("\n".join(row[0] for row in cursor.fetchall()))
+
+    measure("GET /journeys/ search", lambda: client.get(JOURNEY_URL, params), args.repeat)
+    measure("GET /journeys/ unfiltered", lambda: client.get(JOURNEY_URL), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
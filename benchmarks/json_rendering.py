@@ -0,0 +1,61 @@
+"""
+Compare DRF's JSONRenderer with the orjson based ORJSONRenderer.
+
+Renders a page of the journey list and of the order list with both
+renderers, checks that the bytes are identical and prints timings.
+Run from the project root against a seeded database:
+
+    python manage.py seed_journeys --journeys 100000
+    python benchmarks/json_rendering.py --page-size 100
+"""
+
+import argparse
+
+from utils import measure, setup_django
+
+setup_django()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from railwayAPI.renderers import ORJSONRenderer  # noqa: E402
+from stations.models import Journey, Order  # noqa: E402
+from stations.serializers import JourneyListSerializer, OrderListSerializer  # noqa: E402
+
+
+def journey_page(size):
+    journeys = (
+        Journey.annotate_list_fields(Journey.objects.all())
+        .only("id", "departure_time", "arrival_time")
+        .order_by("departure_time", "id")[:size]
+    )
+    return JourneyListSerializer(journeys, many=True).data
+
+
+def order_page(size):
+    orders = Order.objects.prefetch_related("tickets__journey").order_by("-created_at")[:size]
+    return OrderListSerializer(orders, many=True).data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = {
+        "journey list": journey_page(args.page_size),
+        "order list": order_page(args.page_size),
+    }
+    if not payloads["order list"]:
+        print("No orders found, the order list payload will be empty")
+
+    stdlib, fast = JSONRenderer(), ORJSONRenderer()
+    for name, data in payloads.items():
+        assert stdlib.render(data) == fast.render(data), f"{name}: output differs"
+        print(f"{name}: {len(data)} items, {len(stdlib.render(data))} bytes, identical output")
+        measure(f"  JSONRenderer   {name}", lambda: stdlib.render(data), args.repeat)
+        measure(f"  ORJSONRenderer {name}", lambda: fast.render(data), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare startup time and request latency of two settings modules.
+
+Each settings module is measured in a fresh interpreter: the time to
+import Django and run ``django.setup()``, then p50/p99 latency of a list
+request, a request from a browser (``Accept: text/html``) and a 404
+error path. Run from the project root:
+
+    SECRET_KEY=... python benchmarks/settings_profiles.py \\
+        railwayAPI.settings railwayAPI.settings_production
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def child(repeat):
+    started = time.perf_counter()
+    from utils import api_client, measure, setup_django
+
+    setup_django()
+    startup = (time.perf_counter() - started) * 1000
+
+    client = api_client()
+    paths = {
+        "list": ("/api/station/stations/", {}),
+        "browser": ("/api/station/stations/", {"HTTP_ACCEPT": "text/html"}),
+        "not found": ("/api/station/journeys/0/", {}),
+    }
+    for name, (path, headers) in paths.items():
+        client.get(path, **headers)
+        measure(f"  {name}", lambda: client.get(path, **headers), repeat)
+    print(json.dumps({"startup_ms": startup}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("settings", nargs="+")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.repeat)
+        return
+
+    for settings_module in args.settings:
+        print(settings_module)
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", "--repeat", str(args.repeat), settings_module],
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+        results = json.loads(output[-1])
+        print("\n".join(output[:-1]))
+        print(f"  startup: {results['startup_ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Helpers shared by the benchmark scripts in this directory."""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import django
+
+
+def setup_django():
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "railwayAPI.settings")
+    django.setup()
+
+
+def api_client():
+    from django.contrib.auth import get_user_model
+    from rest_framework.test import APIClient
+
+    user, _ = get_user_model().objects.get_or_create(email="benchmark@example.com")
+    client = APIClient(HTTP_HOST="localhost")
+    client.force_authenticate(user=user)
+    return client
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(label, func, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    print(
+        f"{label} x{repeat}: "
+        f"p50={statistics.median(samples):.2f}ms "
+        f"p99={percentile(samples, 0.99):.2f}ms"
+    )
+    return samples
@@ -0,0 +1,41 @@
+"""
+Gunicorn configuration for railwayAPI.
+
+    gunicorn -c gunicorn.conf.py railwayAPI.wsgi
+
+Set GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker and serve
+railwayAPI.asgi:application to run the ASGI stack instead. Send SIGHUP to
+the master for a graceful reload: new workers are started with the
+current code and the old ones finish their in-flight requests first.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# The usual (2 x cores) + 1 for sync workers. Async workers serve many
+# requests each, so one per core is enough.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+default_workers = multiprocessing.cpu_count()
+if worker_class == "sync":
+    default_workers = default_workers * 2 + 1
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# Recycle workers after a bounded number of requests so slow memory growth
+# cannot accumulate; the jitter keeps them from restarting all at once.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# Preloading would keep serving the old code after SIGHUP, so the
+# application is imported by each worker instead.
+preload_app = False
+reload = os.environ.get("GUNICORN_RELOAD", "False") == "True"
+
+accesslog = "-"
+errorlog = "-"
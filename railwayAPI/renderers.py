@@ -0,0 +1,66 @@
+"""orjson based drop-in replacements for DRF's JSON renderer and parser.
+
+Enabled with ``FAST_JSON=True`` (see ``settings.REST_FRAMEWORK``). Output
+matches ``rest_framework.renderers.JSONRenderer`` byte for byte for the
+data this API returns: datetimes, dates, lazy strings and other
+non-native values are passed to DRF's own encoder. Floats that Python
+would print with an exponent (``1e-05``) are written without the
+leading zero (``1e-5``), and NaN/infinity become ``null`` instead of
+raising, neither of which our models produce. Anything the fast path
+does not cover (indented output, ``ensure_ascii``, orjson not installed)
+falls back to the stdlib implementation.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    def __init__(self):
+        super().__init__()
+        self._encoder = self.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self._encoder.default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Same strict-javascript escaping as JSONRenderer.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
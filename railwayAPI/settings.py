@@ -96,6 +96,68 @@ DATABASES = {
     }
 }
 
+# Keep a psycopg connection pool in every worker process instead of opening
+# a new connection per request. CONN_MAX_AGE must stay 0 while pooling;
+# CONN_HEALTH_CHECKS makes the pool check connections before handing them out.
+# A worker serves at most GUNICORN_THREADS requests at a time, so its pool
+# never needs more connections than that. Each database server then sees
+# up to WEB_CONCURRENCY x DB_POOL_MAX_SIZE connections, which must stay
+# below its max_connections (100 by default); every replica gets as many.
+if os.environ.get("DB_POOL", "True") == "True":
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", 1)),
+            "max_size": int(
+                os.environ.get("DB_POOL_MAX_SIZE", os.environ.get("GUNICORN_THREADS", 1))
+            ),
+            "timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", 300)),
+            "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", 3600)),
+        }
+    }
+
+
+# Read replicas: POSTGRES_REPLICA_HOSTS=replica1,replica2 adds one alias per
+# host. Safe-method API requests read from them (see stations.replicas).
+
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(","))):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["stations.replicas.ReplicaRouter"]
+
+REPLICA_CACHE = "default"
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Set CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# CACHE_LOCATION=redis://host:6379 to share the cache between workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+SEAT_HOLD_CACHE = "default"
+SEAT_HOLD_MAX_SEATS = 10
+
+THROTTLE_CACHE = "default"
+
+RESPONSE_CACHE = "default"
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Larger station tables are searched in the database, see stations/search.py
+STATION_SEARCH_MAX_INDEXED = 200_000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -140,23 +202,49 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "user.User"
 
+# orjson based renderer/parser, see railwayAPI/renderers.py
+FAST_JSON = os.environ.get("FAST_JSON", "False") == "True"
+
+# Authenticate from the user_id/is_staff claims of the access token instead
+# of loading the user row on every request. Changes to is_staff or is_active
+# take effect once the user's current access token expires.
+STATELESS_JWT = os.environ.get("STATELESS_JWT", "True") == "True"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "user.authentication.CachedJWTStatelessUserAuthentication"
+        if STATELESS_JWT
+        else "user.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "railwayAPI.renderers.ORJSONRenderer"
+        if FAST_JSON
+        else "rest_framework.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
+    "DEFAULT_PARSER_CLASSES": [
+        "railwayAPI.renderers.ORJSONParser"
+        if FAST_JSON
+        else "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "railwayAPI.throttling.AnonSlidingWindowThrottle",
+        "railwayAPI.throttling.UserSlidingWindowThrottle",
+        "railwayAPI.throttling.ScopedSlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "1000/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "1000/day",
+        "booking": "30/minute",
+        # Per client IP; gateways check up to TOKEN_BATCH_VERIFY_MAX tokens per call.
+        "token_verify": "600/minute",
+    },
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 5,
 }
@@ -168,4 +256,11 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairWithClaimsSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "user.serializers.CachedTokenVerifySerializer",
+    "TOKEN_USER_CLASS": "user.authentication.TokenUser",
 }
+
+# Verified tokens remembered per worker process, see user/authentication.py
+VERIFIED_TOKEN_CACHE_SIZE = 10_000
+TOKEN_BATCH_VERIFY_MAX = 100
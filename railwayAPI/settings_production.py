@@ -0,0 +1,74 @@
+"""
+Production settings for railwayAPI.
+
+Select with DJANGO_SETTINGS_MODULE=railwayAPI.settings_production. Builds
+on railwayAPI.settings and strips the development conveniences: debug
+toolbar, browsable API and per-request template loading. Without the
+connection pool it keeps database connections open between requests.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from railwayAPI.settings import *  # noqa: F401,F403
+from railwayAPI.settings import DATABASES, INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ.get("SECRET_KEY")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("SECRET_KEY must be set in production")
+
+ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
+
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "debug_toolbar.middleware.DebugToolbarMiddleware"
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+# Persistent connections only when the connection pool is turned off.
+if "pool" not in DATABASES["default"].get("OPTIONS", {}):
+    DATABASES = {
+        **DATABASES,
+        "default": {
+            **DATABASES["default"],
+            "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+        },
+    }
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    "DEFAULT_RENDERER_CLASSES": [
+        renderer
+        for renderer in REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]
+        if renderer != "rest_framework.renderers.BrowsableAPIRenderer"
+    ],
+}
+
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
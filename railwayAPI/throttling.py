@@ -0,0 +1,85 @@
+"""Sliding-window rate throttles backed by a shared cache.
+
+DRF's throttles keep the timestamp of every request in the window under
+one cache key, so each check rewrites a list of up to ``num_requests``
+entries, and with the local-memory cache every worker counts on its own.
+These throttles keep two integer counters per key instead, the current
+and the previous fixed window, in ``THROTTLE_CACHE``, which should be a
+cache shared by all workers (Redis in production, local memory in tests).
+The request rate is estimated as::
+
+    previous * (1 - elapsed / duration) + current
+
+The counter is incremented before the check, so concurrent requests can
+never all slip in under the limit, and decremented again when the request
+is throttled: like DRF, only allowed requests count, so a client retrying
+too early is not locked out for longer than its rate says.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, UserRateThrottle
+
+
+class SlidingWindowThrottleMixin:
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now - window * self.duration
+        current_key = f"{self.key}:{window}"
+        # Both windows are read while the current one is live.
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, self.duration * 2)
+            self.current = 1
+        self.previous = self.cache.get(f"{self.key}:{window - 1}", 0)
+        if self.estimate() <= self.num_requests:
+            return True
+        self.cache.decr(current_key)
+        self.current -= 1
+        return False
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed / self.duration) + self.current
+
+    def wait(self):
+        # Room needed for the retried request itself.
+        available = self.num_requests - self.current - 1
+        if available < 0 or not self.previous:
+            return self.duration - self.elapsed
+        # Seconds until the weight of the previous window has decayed enough.
+        return max(self.duration * (1 - available / self.previous) - self.elapsed, 0)
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottleMixin, UserRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottleMixin, ScopedRateThrottle):
+    """Limit views by their ``throttle_scope``; views without one are not limited."""
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -0,0 +1,128 @@
+import time
+from collections import Counter
+
+from rest_framework import serializers
+
+from stations import holds, metrics
+from stations.exceptions import SeatConflict
+from stations.models import Journey, Ticket
+from stations.seats import SeatMap
+
+HOLD_NOT_FOUND_MESSAGE = "Unknown or expired seat hold."
+
+
+def lock_journeys(journey_ids):
+    """Lock the journeys of a booking and record how long that took."""
+    started = time.perf_counter()
+    journeys = Journey.lock_for_booking(journey_ids)
+    waited = time.perf_counter() - started
+    metrics.incr("booking_lock_waits")
+    metrics.incr("booking_lock_wait_seconds", waited, journey_ids=journeys)
+    return journeys
+
+
+def available_seat_maps(journeys, exclude_hold=None):
+    """Seat maps of locked journeys with seats held by other holds marked as taken."""
+    seat_maps = {}
+    for journey_id, held in holds.held_seats(list(journeys), exclude_hold=exclude_hold).items():
+        seat_map = journeys[journey_id].get_seat_map()
+        available = SeatMap(bytes(seat_map), seat_map.cargo, seat_map.places_in_cargo)
+        for cargo_number, seat_number in held:
+            if available.contains(cargo_number, seat_number):
+                available.take(cargo_number, seat_number)
+        seat_maps[journey_id] = available
+    return seat_maps
+
+
+def check_conflicts(tickets, seat_maps):
+    conflicts = Ticket.validate_tickets(tickets, seat_maps, serializers.ValidationError)
+    if conflicts:
+        metrics.incr("booking_conflicts")
+        metrics.incr(
+            "booking_conflicting_seats",
+            len(conflicts),
+            journey_ids=[journey_id for journey_id, _, _ in conflicts],
+        )
+        raise SeatConflict(conflicts)
+
+
+def create_tickets(order, tickets_data, allocations=(), hold_id=None):
+    """Book seats for ``order``.
+
+    ``tickets_data`` lists explicitly chosen seats, ``allocations`` asks
+    for a number of seats per journey, picked server-side from the seats
+    left over, and ``hold_id`` turns a seat hold of the order's user into
+    tickets. Must run inside a transaction: concurrent bookings of a
+    journey are serialized by its row lock, the tickets are inserted with
+    one bulk_create and the updated seat maps are written back.
+    Raises ``SeatConflict`` listing every requested seat that is already
+    taken or held by someone else.
+    """
+    journey_ids = (
+        {ticket_data["journey"].pk for ticket_data in tickets_data}
+        | {allocation["journey"].pk for allocation in allocations}
+    )
+    if hold_id is not None:
+        journey_ids.add(holds.journey_id_of(hold_id))
+    journeys = lock_journeys(journey_ids)
+
+    tickets = [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+    if hold_id is not None:
+        hold = holds.get_hold(hold_id)
+        if hold is None or hold["user"] != order.user_id:
+            raise serializers.ValidationError({"hold": HOLD_NOT_FOUND_MESSAGE})
+        tickets.extend(
+            Ticket(
+                order=order,
+                journey_id=holds.journey_id_of(hold_id),
+                cargo_number=cargo_number,
+                seat_number=seat_number,
+            )
+            for cargo_number, seat_number in hold["seats"]
+        )
+    for ticket in tickets:
+        ticket.journey = journeys[ticket.journey_id]
+
+    seat_maps = available_seat_maps(journeys, exclude_hold=hold_id)
+    check_conflicts(tickets, seat_maps)
+
+    for allocation in allocations:
+        journey = journeys[allocation["journey"].pk]
+        seat_map = seat_maps[journey.pk]
+        seats = seat_map.allocate(allocation["seats"])
+        if seats is None:
+            raise serializers.ValidationError({
+                "allocate": f"Journey {journey.pk} has only {seat_map.free_count()} seats left"
+            })
+        for cargo_number, seat_number in seats:
+            seat_map.take(cargo_number, seat_number)
+            tickets.append(
+                Ticket(order=order, journey=journey, cargo_number=cargo_number, seat_number=seat_number)
+            )
+
+    Ticket.objects.bulk_create(tickets)
+
+    sold = Counter(ticket.journey_id for ticket in tickets)
+    sold_seat_maps = {journey_id: journeys[journey_id].get_seat_map() for journey_id in sold}
+    for ticket in tickets:
+        sold_seat_maps[ticket.journey_id].take(ticket.cargo_number, ticket.seat_number)
+    for journey_id, amount in sold.items():
+        journeys[journey_id].save_seat_map(sold_seat_maps[journey_id], amount)
+    if hold_id is not None:
+        holds.release_hold(hold_id)
+    metrics.incr("booking_tickets", len(tickets))
+    return tickets
+
+
+def hold_seats(journey_id, seats, seconds, user_id):
+    """Hold free seats of a journey for ``seconds``; returns ``(hold_id, hold)``."""
+    journeys = lock_journeys([journey_id])
+    if journey_id not in journeys:
+        raise serializers.ValidationError({"journey": "Journey does not exist."})
+    journey = journeys[journey_id]
+    tickets = [
+        Ticket(journey=journey, cargo_number=cargo_number, seat_number=seat_number)
+        for cargo_number, seat_number in seats
+    ]
+    check_conflicts(tickets, available_seat_maps(journeys))
+    return holds.create_hold(journey_id, seats, seconds, user_id)
@@ -0,0 +1,120 @@
+"""Versioned response caching and conditional GET for read-mostly endpoints.
+
+A cached page is keyed by the versions of every model it renders, plus
+the host and query string. Saving or deleting one of those models bumps
+its version (see ``stations.signals``), so stale pages are never read
+again and simply expire. The same versions give cheap ETags.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from stations import metrics
+from stations.replicas import read_from_primary
+from stations.versions import get_versions
+
+
+def model_version_name(model):
+    return f"model:{model._meta.label_lower}"
+
+
+class CachedListMixin:
+    """Serve ``list`` from the cache configured by ``RESPONSE_CACHE``.
+
+    ``cache_models`` lists every model whose changes must invalidate the
+    cached pages, including related models shown through the serializer.
+    """
+
+    cache_models = ()
+
+    def get_list_cache_key(self, request):
+        versions = get_versions([model_version_name(model) for model in self.cache_models])
+        raw_key = "|".join([
+            request.get_host(),
+            request.get_full_path(),
+            *(f"{name}={version}" for name, version in sorted(versions.items())),
+        ])
+        digest = hashlib.sha256(raw_key.encode()).hexdigest()
+        return f"stations:response:{self.basename}:{digest}"
+
+    def list(self, request, *args, **kwargs):
+        cache = caches[settings.RESPONSE_CACHE]
+        key = self.get_list_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            metrics.incr("response_cache_hits")
+            return Response(data)
+
+        metrics.incr("response_cache_misses")
+        # The page is cached under the current versions, so it must not
+        # come from a replica that is still behind them.
+        with read_from_primary():
+            response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+
+class ConditionalGetMixin:
+    """Strong ETags and ``If-None-Match`` handling for ``list``.
+
+    The ETag hashes the request path, the negotiated format and the
+    versions returned by ``get_etag_parts``, so a 304 is answered without
+    touching the serializer. By default the parts are the versions of
+    ``cache_models``; views with per-object data extend them.
+    """
+
+    cache_models = ()
+    etag_actions = ("list", "retrieve")
+
+    def get_etag_parts(self, request):
+        versions = get_versions([model_version_name(model) for model in self.cache_models])
+        return [f"{name}={version}" for name, version in sorted(versions.items())]
+
+    def get_etag(self, request):
+        raw_etag = "|".join([
+            self.basename,
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_renderer.format,
+            *self.get_etag_parts(request),
+        ])
+        return '"%s"' % hashlib.sha256(raw_etag.encode()).hexdigest()[:32]
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        if self.action not in self.etag_actions:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            metrics.incr("conditional_get_not_modified")
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        # The body is tagged with the current versions, so it must not come
+        # from a replica that is still behind them; clients would keep it
+        # through 304s until the next change.
+        with read_from_primary():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """``ConditionalGetMixin`` for viewsets that also have a detail route."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+
+def hit_ratio(counters):
+    hits = counters.get("response_cache_hits", 0)
+    total = hits + counters.get("response_cache_misses", 0)
+    return hits / total if total else None
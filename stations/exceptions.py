@@ -0,0 +1,19 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already taken."
+    default_code = "seat_conflict"
+
+    def __init__(self, conflicting_seats=()):
+        super().__init__()
+        # Set after __init__ so seat numbers are not coerced to strings.
+        self.detail = {
+            "detail": self.detail,
+            "conflicting_seats": [
+                {"journey": journey_id, "cargo_number": cargo_number, "seat_number": seat_number}
+                for journey_id, cargo_number, seat_number in conflicting_seats
+            ],
+        }
@@ -0,0 +1,116 @@
+"""In-process index of station coordinates.
+
+``StationIndex`` keeps every station in numpy arrays sorted by latitude.
+A nearest-station or bounding-box query narrows the candidates to a
+latitude band with a binary search and computes the distances of the
+whole band in one vectorised pass. The index is rebuilt lazily when a
+station changes.
+"""
+
+import numpy as np
+
+from stations.caching import model_version_name
+from stations.distance import EARTH_RADIUS_KM, haversine_km
+from stations.models import Station
+from stations.versions import VersionedSnapshot
+
+HALF_CIRCUMFERENCE_KM = np.pi * EARTH_RADIUS_KM
+
+
+class StationIndex:
+    def __init__(self, rows):
+        rows = sorted(rows, key=lambda row: row[2])
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.names = [row[1] for row in rows]
+        self.latitudes = np.array([row[2] for row in rows], dtype=np.float64)
+        self.longitudes = np.array([row[3] for row in rows], dtype=np.float64)
+
+    @classmethod
+    def from_database(cls):
+        return cls(Station.objects.values_list("id", "name", "latitude", "longitude"))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _band(self, min_latitude, max_latitude):
+        start = np.searchsorted(self.latitudes, min_latitude, side="left")
+        stop = np.searchsorted(self.latitudes, max_latitude, side="right")
+        return slice(start, stop)
+
+    def _stations(self, positions, distances=None):
+        stations = []
+        for rank, position in enumerate(positions):
+            station = {
+                "id": int(self.ids[position]),
+                "name": self.names[position],
+                "latitude": float(self.latitudes[position]),
+                "longitude": float(self.longitudes[position]),
+            }
+            if distances is not None:
+                station["distance"] = float(distances[rank])
+            stations.append(station)
+        return stations
+
+    def nearest(self, latitude, longitude, limit, radius=None):
+        """Up to ``limit`` stations closest to a point, optionally within ``radius`` km.
+
+        Stations within ``d`` km can only lie in the latitude band ``d`` km
+        north and south of the point, so only that band is measured. With
+        ``radius`` the band is that wide. Without one it starts where about
+        ``limit`` stations are expected and doubles until it holds ``limit``
+        stations no farther away than its own half-width.
+        """
+        if radius is not None:
+            candidates, distances = self._measure_band(latitude, longitude, radius)
+            inside = distances <= radius
+            return self._closest(candidates[inside], distances[inside], limit)
+
+        spread = self._expected_spread(limit)
+        while True:
+            candidates, distances = self._measure_band(latitude, longitude, spread)
+            if spread >= HALF_CIRCUMFERENCE_KM:
+                break
+            if len(candidates) >= limit and np.partition(distances, limit - 1)[limit - 1] <= spread:
+                break
+            spread *= 2
+        return self._closest(candidates, distances, limit)
+
+    def _expected_spread(self, limit):
+        """Half-width in km of a band holding about ``limit`` stations."""
+        if len(self) < 2:
+            return HALF_CIRCUMFERENCE_KM
+        span = np.radians(self.latitudes[-1] - self.latitudes[0]) * EARTH_RADIUS_KM
+        return max(span * limit / len(self), 1.0)
+
+    def _measure_band(self, latitude, longitude, spread):
+        if spread >= HALF_CIRCUMFERENCE_KM:
+            band = slice(0, len(self))
+        else:
+            degrees = np.degrees(spread / EARTH_RADIUS_KM)
+            band = self._band(latitude - degrees, latitude + degrees)
+        distances = haversine_km(
+            latitude, longitude, self.latitudes[band], self.longitudes[band]
+        )
+        return np.arange(band.start, band.stop), distances
+
+    def _closest(self, candidates, distances, limit):
+        if len(candidates) > limit:
+            closest = np.argpartition(distances, limit - 1)[:limit]
+            candidates, distances = candidates[closest], distances[closest]
+        order = np.lexsort((self.ids[candidates], distances))
+        return self._stations(candidates[order], distances[order])
+
+    def within(self, min_latitude, min_longitude, max_latitude, max_longitude):
+        """Stations inside a bounding box; it crosses the antimeridian when
+        ``min_longitude`` is greater than ``max_longitude``."""
+        band = self._band(min_latitude, max_latitude)
+        longitudes = self.longitudes[band]
+        if min_longitude <= max_longitude:
+            inside = (longitudes >= min_longitude) & (longitudes <= max_longitude)
+        else:
+            inside = (longitudes >= min_longitude) | (longitudes <= max_longitude)
+        positions = np.arange(band.start, band.stop)[inside]
+        return self._stations(positions[np.argsort(self.ids[positions], kind="stable")])
+
+
+station_index = VersionedSnapshot(model_version_name(Station), StationIndex.from_database)
@@ -0,0 +1,94 @@
+"""Temporary seat holds kept in an expiring cache.
+
+All holds of a journey live under one cache key as
+``{hold_id: {"user": ..., "seats": [[cargo, seat], ...], "expires_at": ...}}``.
+Holds are only written while the journey row is locked by
+``Journey.lock_for_booking``, which makes the read-modify-write of that
+key safe across worker processes. Reads need no lock.
+"""
+
+import math
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+def _cache():
+    return caches[settings.SEAT_HOLD_CACHE]
+
+
+def _key(journey_id):
+    return f"stations:seat-holds:{journey_id}"
+
+
+def _active(holds, now):
+    return {
+        hold_id: hold for hold_id, hold in (holds or {}).items() if hold["expires_at"] > now
+    }
+
+
+def journey_holds(journey_ids):
+    """Return ``{journey_id: {hold_id: hold}}`` of active holds, in one cache read."""
+    now = time.time()
+    stored = _cache().get_many([_key(journey_id) for journey_id in journey_ids])
+    return {
+        journey_id: _active(stored.get(_key(journey_id)), now) for journey_id in journey_ids
+    }
+
+
+def held_seats(journey_ids, exclude_hold=None):
+    """Return ``{journey_id: {(cargo_number, seat_number), ...}}`` of held seats."""
+    return {
+        journey_id: {
+            tuple(seat)
+            for hold_id, hold in holds.items()
+            if hold_id != exclude_hold
+            for seat in hold["seats"]
+        }
+        for journey_id, holds in journey_holds(journey_ids).items()
+    }
+
+
+def journey_id_of(hold_id):
+    journey_id, _, _ = str(hold_id).partition(":")
+    return int(journey_id) if journey_id.isdigit() else None
+
+
+def get_hold(hold_id):
+    journey_id = journey_id_of(hold_id)
+    if journey_id is None:
+        return None
+    return journey_holds([journey_id])[journey_id].get(hold_id)
+
+
+def create_hold(journey_id, seats, seconds, user_id):
+    """Store a new hold; the caller must hold the journey row lock."""
+    now = time.time()
+    holds = _active(_cache().get(_key(journey_id)), now)
+    hold_id = f"{journey_id}:{uuid.uuid4().hex}"
+    holds[hold_id] = {
+        "user": user_id,
+        "seats": [list(seat) for seat in seats],
+        "expires_at": now + seconds,
+    }
+    _save(journey_id, holds, now)
+    return hold_id, holds[hold_id]
+
+
+def release_hold(hold_id):
+    """Drop a hold; the caller must hold the journey row lock."""
+    journey_id = journey_id_of(hold_id)
+    now = time.time()
+    holds = _active(_cache().get(_key(journey_id)), now)
+    if holds.pop(hold_id, None) is not None:
+        _save(journey_id, holds, now)
+
+
+def _save(journey_id, holds, now):
+    if holds:
+        timeout = math.ceil(max(hold["expires_at"] for hold in holds.values()) - now)
+        _cache().set(_key(journey_id), holds, timeout)
+    else:
+        _cache().delete(_key(journey_id))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from stations.models import Journey
+
+
+class Command(BaseCommand):
+    help = "Recalculate Journey seat maps and tickets_sold counters from the ticket table"
+
+    def handle(self, *args, **options):
+        # Every batch is locked and written in its own transaction, so
+        # bookings only wait for the batch being rebuilt.
+        rebuilt = Journey.rebuild_seat_inventory()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt seat inventory for {rebuilt} journeys")
+        )
@@ -0,0 +1,68 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from stations.caching import model_version_name
+from stations.models import Route
+from stations.versions import invalidate
+
+
+class Command(BaseCommand):
+    help = "Recompute every Route.distance as the great-circle distance between its stations"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rows = np.array(
+            list(
+                Route.objects.order_by("id").values_list(
+                    "id",
+                    "distance",
+                    "source__latitude",
+                    "source__longitude",
+                    "destination__latitude",
+                    "destination__longitude",
+                ).iterator(chunk_size=10_000)
+            ),
+            dtype=np.float64,
+        ).reshape(-1, 6)
+        distances = Route.great_circle_distance(rows[:, 2], rows[:, 3], rows[:, 4], rows[:, 5])
+        changed = distances != rows[:, 1]
+        ids, distances = rows[changed, 0].astype(np.int64), distances[changed]
+
+        batch_size = options["batch_size"]
+        with transaction.atomic():
+            for start in range(0, len(ids), batch_size):
+                self.write_distances(
+                    ids[start:start + batch_size].tolist(),
+                    distances[start:start + batch_size].tolist(),
+                )
+            if len(ids):
+                invalidate(model_version_name(Route))
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the distance of {len(ids)} of {len(rows)} routes")
+        )
+
+    @staticmethod
+    def write_distances(ids, distances):
+        """Update one chunk of routes, in a single statement on PostgreSQL.
+
+        ``bulk_update`` resolves a ``CASE WHEN`` expression per row in Python,
+        which takes far longer than the database needs for the update.
+        """
+        table = connection.ops.quote_name(Route._meta.db_table)
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    f"UPDATE {table} AS route SET distance = data.distance "
+                    "FROM unnest(%s::bigint[], %s::double precision[]) AS data(id, distance) "
+                    "WHERE route.id = data.id",
+                    [ids, distances],
+                )
+            else:
+                cursor.executemany(
+                    f"UPDATE {table} SET distance = %s WHERE id = %s",
+                    list(zip(distances, ids)),
+                )
@@ -0,0 +1,84 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from stations.models import Station, Route, Train, Journey
+
+
+class Command(BaseCommand):
+    help = "Seed stations, routes, trains and journeys for load testing and benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stations", type=int, default=500)
+        parser.add_argument("--routes", type=int, default=5000)
+        parser.add_argument("--trains", type=int, default=100)
+        parser.add_argument("--journeys", type=int, default=1_000_000)
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            stations = Station.objects.bulk_create(
+                [
+                    Station(
+                        name=f"Station {number}",
+                        latitude=rng.uniform(44.0, 52.0),
+                        longitude=rng.uniform(22.0, 40.0),
+                    )
+                    for number in range(options["stations"])
+                ],
+                batch_size=batch_size,
+            )
+            routes = []
+            for _ in range(options["routes"]):
+                source, destination = rng.sample(stations, 2)
+                distance = Route.great_circle_distance(
+                    source.latitude, source.longitude, destination.latitude, destination.longitude
+                )
+                routes.append(
+                    Route(
+                        source=source,
+                        destination=destination,
+                        distance=float(distance),
+                        key=Route.build_key(source.name, destination.name),
+                    )
+                )
+            routes = Route.objects.bulk_create(routes, batch_size=batch_size)
+            trains = Train.objects.bulk_create(
+                [
+                    Train(name=f"Train {number}", cargo=rng.randint(5, 20), places_in_cargo=rng.randint(20, 80))
+                    for number in range(options["trains"])
+                ],
+                batch_size=batch_size,
+            )
+        self.stdout.write(
+            f"Created {len(stations)} stations, {len(routes)} routes, {len(trains)} trains"
+        )
+
+        start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        window_minutes = options["days"] * 24 * 60
+        created = 0
+        while created < options["journeys"]:
+            size = min(batch_size, options["journeys"] - created)
+            journeys = []
+            for _ in range(size):
+                departure_time = start + timedelta(minutes=rng.randrange(window_minutes))
+                journeys.append(
+                    Journey(
+                        route=rng.choice(routes),
+                        train=rng.choice(trains),
+                        departure_time=departure_time,
+                        arrival_time=departure_time + timedelta(minutes=rng.randint(30, 900)),
+                    )
+                )
+            Journey.objects.bulk_create(journeys)
+            created += size
+            self.stdout.write(f"Created {created} journeys")
+
+        self.stdout.write(self.style.SUCCESS("Seeding finished"))
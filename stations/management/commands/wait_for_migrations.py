@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.utils import OperationalError
+
+
+class Command(BaseCommand):
+    help = "Wait until the database is reachable and every migration is applied"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument("--interval", type=float, default=1)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        deadline = time.monotonic() + options["timeout"]
+        connection = connections[options["database"]]
+        while True:
+            try:
+                pending = self.pending_migrations(connection)
+            except OperationalError as error:
+                reason = f"database unavailable: {error}"
+            else:
+                if not pending:
+                    break
+                reason = f"{len(pending)} migrations not applied"
+            if time.monotonic() >= deadline:
+                raise CommandError(f"Not ready: {reason}")
+            self.stdout.write(f"Waiting, {reason}")
+            connection.close()
+            time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Database is ready"))
+
+    @staticmethod
+    def pending_migrations(connection):
+        executor = MigrationExecutor(connection)
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
@@ -0,0 +1,52 @@
+"""Process-local booking counters.
+
+Every worker process keeps its own numbers; ``snapshot`` reports them
+together with the pid so readings from several workers can be told apart.
+"""
+
+import os
+import threading
+from collections import Counter, defaultdict
+
+from django.db import connections
+
+_lock = threading.Lock()
+_counters = Counter()
+_journey_counters = defaultdict(Counter)
+
+
+def incr(name, amount=1, journey_ids=()):
+    with _lock:
+        _counters[name] += amount
+        for journey_id in journey_ids:
+            _journey_counters[name][journey_id] += amount
+
+
+def snapshot(top=10):
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "counters": dict(_counters),
+            "hot_journeys": {
+                name: [
+                    {"journey": journey_id, "value": value}
+                    for journey_id, value in counter.most_common(top)
+                ]
+                for name, counter in _journey_counters.items()
+            },
+        }
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _journey_counters.clear()
+
+
+def database_pools():
+    """Statistics of the connection pools this process has opened."""
+    return {
+        connection.alias: connection.pool.get_stats()
+        for connection in connections.all(initialized_only=True)
+        if getattr(connection, "pool", None) is not None
+    }
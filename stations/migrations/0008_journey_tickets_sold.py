@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_tickets_sold(apps, schema_editor):
+    Journey = apps.get_model("stations", "Journey")
+    Ticket = apps.get_model("stations", "Ticket")
+    sold = (
+        Ticket.objects.filter(journey=OuterRef("pk"))
+        .order_by()
+        .values("journey")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Journey.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0007_train_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="tickets_sold",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_tickets_sold, migrations.RunPython.noop),
+    ]
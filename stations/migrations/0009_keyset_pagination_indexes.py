@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0008_journey_tickets_sold"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time", "id"], name="journey_departure_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="order_user_created_id_idx"
+            ),
+        ),
+    ]
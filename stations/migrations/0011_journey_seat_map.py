@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+from stations.seats import SeatMap
+
+
+BATCH_SIZE = 1000
+
+
+def populate_seat_map_batch(Journey, Ticket, journeys):
+    seat_maps = {
+        journey.pk: SeatMap(b"", journey.train.cargo, journey.train.places_in_cargo)
+        for journey in journeys
+    }
+    tickets = Ticket.objects.filter(journey_id__in=seat_maps).values_list(
+        "journey_id", "cargo_number", "seat_number"
+    )
+    for journey_id, cargo_number, seat_number in tickets:
+        if seat_maps[journey_id].contains(cargo_number, seat_number):
+            seat_maps[journey_id].take(cargo_number, seat_number)
+    for journey in journeys:
+        journey.seat_map = bytes(seat_maps[journey.pk])
+    Journey.objects.bulk_update(journeys, ["seat_map"])
+
+
+def populate_seat_map(apps, schema_editor):
+    Journey = apps.get_model("stations", "Journey")
+    Ticket = apps.get_model("stations", "Ticket")
+    journeys = Journey.objects.select_related("train").order_by("pk")
+    batch = []
+    for journey in journeys.iterator(chunk_size=BATCH_SIZE):
+        batch.append(journey)
+        if len(batch) == BATCH_SIZE:
+            populate_seat_map_batch(Journey, Ticket, batch)
+            batch = []
+    if batch:
+        populate_seat_map_batch(Journey, Ticket, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0010_journey_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="seat_map",
+            field=models.BinaryField(default=b""),
+        ),
+        migrations.RunPython(populate_seat_map, migrations.RunPython.noop),
+    ]
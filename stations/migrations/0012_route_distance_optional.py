@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0011_journey_seat_map"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="route",
+            name="distance",
+            field=models.FloatField(
+                blank=True,
+                help_text="km, the great-circle distance between the stations when left empty",
+            ),
+        ),
+    ]
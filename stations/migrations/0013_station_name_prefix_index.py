@@ -0,0 +1,29 @@
+from django.db import migrations
+
+INDEX_NAME = "station_name_upper_prefix_idx"
+
+
+def create_index(apps, schema_editor):
+    # Serves name__istartswith, which Django runs as UPPER(name::text) LIKE
+    # 'PREFIX%'; text_pattern_ops makes LIKE usable with any collation.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+            "ON stations_station ((UPPER(name::text)) text_pattern_ops)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0012_route_distance_optional"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def fill_route_keys(apps, schema_editor):
+    Route = apps.get_model("stations", "Route")
+    Station = apps.get_model("stations", "Station")
+    names = Station.objects.values("name")
+    Route.objects.update(
+        key=Concat(
+            Subquery(names.filter(pk=OuterRef("source_id"))[:1]),
+            Value(" -> "),
+            Subquery(names.filter(pk=OuterRef("destination_id"))[:1]),
+            output_field=models.CharField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stations", "0013_station_name_prefix_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="route",
+            name="key",
+            field=models.CharField(
+                default="",
+                editable=False,
+                max_length=204,
+                help_text='"Source -> Destination", kept in sync with the station names',
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_route_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="route",
+            name="key",
+            field=models.CharField(
+                db_index=True,
+                editable=False,
+                max_length=204,
+                help_text='"Source -> Destination", kept in sync with the station names',
+            ),
+        ),
+    ]
@@ -1,12 +1,19 @@
 import pathlib
 import uuid
 
+import numpy as np
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Greatest
 from django.utils.text import slugify
 from drf_spectacular.utils import extend_schema_field
 from rest_framework.exceptions import ValidationError
 
+from stations.distance import haversine_km
+from stations.seats import SeatMap
+from stations.versions import invalidate
+
 
 class Station(models.Model):
     name = models.CharField(max_length=100)
@@ -28,12 +35,75 @@ class Route(models.Model):
         on_delete=models.CASCADE,
         related_name="routes_to"
     )
-    distance = models.FloatField()
+    distance = models.FloatField(
+        blank=True,
+        help_text="km, the great-circle distance between the stations when left empty",
+    )
+    key = models.CharField(
+        max_length=204,
+        db_index=True,
+        editable=False,
+        help_text='"Source -> Destination", kept in sync with the station names',
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["source", "destination"], name="route_source_destination_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.key = self.build_key(self.source.name, self.destination.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"source", "destination"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "key"}
+        if self.distance is None:
+            self.distance = float(self.great_circle_distance(
+                self.source.latitude,
+                self.source.longitude,
+                self.destination.latitude,
+                self.destination.longitude,
+            ))
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def great_circle_distance(source_lat, source_lon, destination_lat, destination_lon):
+        """Distance in km rounded to 100 m; takes scalars or numpy arrays."""
+        return np.round(haversine_km(source_lat, source_lon, destination_lat, destination_lon), 1)
+
+    @staticmethod
+    def build_key(source_name, destination_name):
+        return f"{source_name} -> {destination_name}"
+
+    @staticmethod
+    def refresh_keys(routes):
+        """Rebuild the keys of ``routes`` from the current station names in one UPDATE."""
+        names = Station.objects.values("name")
+        return routes.update(
+            key=Concat(
+                Subquery(names.filter(pk=OuterRef("source_id"))[:1]),
+                Value(" -> "),
+                Subquery(names.filter(pk=OuterRef("destination_id"))[:1]),
+                output_field=models.CharField(),
+            )
+        )
+
+    @staticmethod
+    def resolve_keys(keys):
+        """Map route keys to the routes carrying them, with one indexed query.
+
+        Station names are not unique, so a key may belong to several
+        routes; each key maps to a list ordered by id. Unknown keys are
+        left out.
+        """
+        resolved = {}
+        for route in Route.objects.filter(key__in=set(keys)).order_by("pk"):
+            resolved.setdefault(route.key, []).append(route)
+        return resolved
 
     @property
     @extend_schema_field(str)
     def full_route(self):
-        return f"{self.source.name} -> {self.destination.name}"
+        return self.key
 
     def __str__(self):
         return f"{self.source} → {self.destination}"
@@ -79,10 +149,155 @@ class Journey(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField("Crew", related_name="journeys")
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    seat_map = models.BinaryField(default=b"", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["departure_time", "id"], name="journey_departure_id_idx"),
+            models.Index(fields=["route", "departure_time"], name="journey_route_departure_idx"),
+        ]
 
     def __str__(self):
         return f"{self.route} {self.train} {self.departure_time} {self.arrival_time}"
 
+    def save(self, *args, **kwargs):
+        # Seat inventory is only written by the booking code under a row
+        # lock, so a plain save must not overwrite it with a stale copy.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in ("tickets_sold", "seat_map")
+            ]
+        return super().save(*args, **kwargs)
+
+    @staticmethod
+    def annotate_list_fields(journeys):
+        """Add the values shown in the journey list, computed by the database.
+
+        ``route_name`` and ``train_name`` read like ``str(route)`` and
+        ``str(train)`` without loading the related rows.
+        """
+        return journeys.annotate(
+            tickets_available=F("train__cargo") * F("train__places_in_cargo") - F("tickets_sold"),
+            route_name=Concat(
+                "route__source__name",
+                Value(" → "),
+                "route__destination__name",
+                output_field=models.CharField(),
+            ),
+            train_name=Concat(
+                "train__name",
+                Value(" <UNK> "),
+                Coalesce("train__train_type__name", Value("None")),
+                output_field=models.CharField(),
+            ),
+        )
+
+    @staticmethod
+    def crew_names(journey_ids):
+        """Full names of the crew of each journey, with one query."""
+        names = {journey_id: [] for journey_id in journey_ids}
+        rows = (
+            Journey.crew.through.objects.filter(journey_id__in=journey_ids)
+            .annotate(
+                name=Concat(
+                    "crew__first_name",
+                    Value(" "),
+                    "crew__last_name",
+                    output_field=models.CharField(),
+                )
+            )
+            .order_by("journey_id", "crew_id")
+            .values_list("journey_id", "name")
+        )
+        for journey_id, name in rows:
+            names[journey_id].append(name)
+        return names
+
+    def get_seat_map(self):
+        return SeatMap(self.seat_map, self.train.cargo, self.train.places_in_cargo)
+
+    def save_seat_map(self, seat_map, tickets_sold_change):
+        self.seat_map = bytes(seat_map)
+        Journey.objects.filter(pk=self.pk).update(
+            seat_map=self.seat_map,
+            tickets_sold=Greatest(F("tickets_sold") + tickets_sold_change, 0),
+        )
+        invalidate(Journey.version_name(self.pk))
+
+    @staticmethod
+    def version_name(journey_id):
+        return f"journey:{journey_id}"
+
+    @staticmethod
+    def lock_for_booking(journey_ids):
+        """Lock journeys (in id order, to avoid deadlocks) for a seat update."""
+        return (
+            Journey.objects.select_for_update(of=("self",))
+            .select_related("train")
+            .filter(pk__in=journey_ids)
+            .order_by("pk")
+            .in_bulk()
+        )
+
+    @staticmethod
+    def update_seats(journey_id, taken=(), released=()):
+        # Called from Ticket signals, which Django sends outside the
+        # transaction of the save; the row lock needs one of its own.
+        with transaction.atomic():
+            journey = Journey.lock_for_booking([journey_id]).get(journey_id)
+            if journey is None:
+                return
+            seat_map = journey.get_seat_map()
+            for cargo_number, seat_number in taken:
+                seat_map.take(cargo_number, seat_number)
+            for cargo_number, seat_number in released:
+                seat_map.release(cargo_number, seat_number)
+            journey.save_seat_map(seat_map, len(taken) - len(released))
+
+    @staticmethod
+    def rebuild_seat_inventory(journeys=None, batch_size=1000):
+        """Recompute seat maps and tickets_sold counters from the ticket table.
+
+        Each batch of journeys is locked like a booking before its tickets
+        are read, so a booking cannot commit between the read and the write.
+        """
+        journeys = Journey.objects.all() if journeys is None else journeys
+        journey_ids = journeys.order_by("pk").values_list("pk", flat=True)
+        rebuilt = 0
+        batch = []
+        for journey_id in journey_ids.iterator(chunk_size=batch_size):
+            batch.append(journey_id)
+            if len(batch) == batch_size:
+                rebuilt += Journey._rebuild_seat_inventory_batch(batch)
+                batch = []
+        if batch:
+            rebuilt += Journey._rebuild_seat_inventory_batch(batch)
+        return rebuilt
+
+    @staticmethod
+    def _rebuild_seat_inventory_batch(journey_ids):
+        with transaction.atomic():
+            journeys = list(Journey.lock_for_booking(journey_ids).values())
+            seat_maps = {}
+            for journey in journeys:
+                seat_maps[journey.pk] = SeatMap(
+                    b"", journey.train.cargo, journey.train.places_in_cargo
+                )
+            tickets = Ticket.objects.filter(journey_id__in=seat_maps).values_list(
+                "journey_id", "cargo_number", "seat_number"
+            )
+            for journey_id, cargo_number, seat_number in tickets:
+                if seat_maps[journey_id].contains(cargo_number, seat_number):
+                    seat_maps[journey_id].take(cargo_number, seat_number)
+            for journey in journeys:
+                journey.seat_map = bytes(seat_maps[journey.pk])
+                journey.tickets_sold = seat_maps[journey.pk].taken_count()
+            Journey.objects.bulk_update(journeys, ["seat_map", "tickets_sold"])
+        return len(journeys)
+
 
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -92,10 +307,18 @@ class Order(models.Model):
         related_name="orders"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"], name="order_user_created_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.created_at} {self.user}"
 
 
+UNIQUE_SEAT_MESSAGE = "The fields cargo_number, seat_number, journey must make a unique set."
+
+
 class Ticket(models.Model):
     cargo_number = models.IntegerField()
     seat_number = models.IntegerField()
@@ -116,6 +339,36 @@ class Ticket(models.Model):
                 raise error_to_raise({
                     ticket_attr_name: f"{ticket_attr_name} must be between 1 and {count_attrs}"
                 })
+
+    @staticmethod
+    def validate_tickets(tickets, seat_maps, error_to_raise):
+        """Validate unsaved tickets against the seat maps of their journeys.
+
+        ``seat_maps`` maps journey ids to ``SeatMap`` objects of locked
+        journeys, so no ticket rows are read. Free seats are marked as
+        taken once checked; seats that were already taken are returned as
+        ``(journey_id, cargo_number, seat_number)`` tuples.
+        """
+        requested = set()
+        conflicts = []
+        for ticket in tickets:
+            Ticket.validate_ticket(
+                ticket.cargo_number,
+                ticket.seat_number,
+                ticket.journey,
+                error_to_raise,
+            )
+            seat = (ticket.journey_id, ticket.cargo_number, ticket.seat_number)
+            if seat in requested:
+                raise error_to_raise({"non_field_errors": UNIQUE_SEAT_MESSAGE})
+            requested.add(seat)
+            seat_map = seat_maps[ticket.journey_id]
+            if seat_map.is_taken(ticket.cargo_number, ticket.seat_number):
+                conflicts.append(seat)
+            else:
+                seat_map.take(ticket.cargo_number, ticket.seat_number)
+        return conflicts
+
     def clean(self):
         Ticket.validate_ticket(
             self.cargo_number,
@@ -0,0 +1,124 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, Cursor, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination over an indexed ordering that ends with ``id``.
+
+    The cursor holds every ordering value of the row at the page edge and
+    the next page starts strictly after that tuple, e.g.
+    ``(departure_time, id) > (x, y)``. As the tuple is unique, no OFFSET is
+    needed even when many rows share the first value, so the database
+    never scans the rows before the requested page and deep pages cost the
+    same as the first.
+    """
+
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        has_position = self.cursor is not None and self.cursor.position is not None
+        if has_position:
+            values = self._decode_position(queryset.model, self.cursor.position)
+            queryset = queryset.filter(self._after(ordering, values))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_position, has_more
+        else:
+            self.has_next, self.has_previous = has_more, has_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field_name = order.lstrip("-")
+            value = instance[field_name] if isinstance(instance, dict) else getattr(instance, field_name)
+            values.append(str(value))
+        return json.dumps(values)
+
+    def _decode_position(self, model, position):
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _after(ordering, values):
+        """Rows that come after ``values`` in ``ordering``, compared as a tuple.
+
+        The redundant bound on the first column lets the database start an
+        index range scan at the cursor instead of evaluating the OR for
+        every row.
+        """
+        lookups = []
+        for order in ordering:
+            lookups.append((order.lstrip("-"), "lt" if order.startswith("-") else "gt"))
+
+        after = Q()
+        for index, (field_name, lookup) in enumerate(lookups):
+            equal = {name: value for (name, _), value in zip(lookups[:index], values)}
+            after |= Q(**equal, **{f"{field_name}__{lookup}": values[index]})
+        first_name, first_lookup = lookups[0]
+        return Q(**{f"{first_name}__{first_lookup}e": values[0]}) & after
+
+
+class JourneyPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class TicketPagination(KeysetPagination):
+    ordering = ("id",)
@@ -0,0 +1,111 @@
+"""Earliest-arrival journey planning with the Connection Scan Algorithm.
+
+Every ``Journey`` is a single connection from its route source to its
+route destination. The timetable is held in flat arrays sorted by
+departure time and rebuilt lazily when journeys or routes change.
+"""
+
+import bisect
+import math
+from array import array
+from datetime import datetime, timezone
+
+from stations.models import Journey
+from stations.versions import VersionedSnapshot
+
+TIMETABLE_VERSION = "timetable"
+
+
+class Timetable:
+    def __init__(self, rows):
+        self.journey_ids = array("q")
+        self.sources = array("q")
+        self.destinations = array("q")
+        self.departures = array("d")
+        self.arrivals = array("d")
+        self.station_index = {}
+        self.station_ids = []
+
+        for journey_id, source_id, destination_id, departure, arrival in rows:
+            self.journey_ids.append(journey_id)
+            self.sources.append(self._index(source_id))
+            self.destinations.append(self._index(destination_id))
+            self.departures.append(departure.timestamp())
+            self.arrivals.append(arrival.timestamp())
+
+    @classmethod
+    def from_database(cls):
+        return cls(
+            Journey.objects.order_by("departure_time", "id").values_list(
+                "id",
+                "route__source_id",
+                "route__destination_id",
+                "departure_time",
+                "arrival_time",
+            ).iterator(chunk_size=10_000)
+        )
+
+    def _index(self, station_id):
+        index = self.station_index.get(station_id)
+        if index is None:
+            index = self.station_index[station_id] = len(self.station_ids)
+            self.station_ids.append(station_id)
+        return index
+
+    def earliest_arrival(self, source_id, destination_id, departure_after, min_transfer, horizon):
+        """Return the legs of the earliest arriving itinerary, or ``None``.
+
+        ``min_transfer`` and ``horizon`` are ``timedelta`` objects; the
+        scan stops at connections departing later than ``horizon`` after
+        ``departure_after``.
+        """
+        source = self.station_index.get(source_id)
+        target = self.station_index.get(destination_id)
+        if source is None or target is None or source == target:
+            return None
+
+        start = departure_after.timestamp()
+        transfer = min_transfer.total_seconds()
+        last_departure = start + horizon.total_seconds()
+        arrival = [math.inf] * len(self.station_ids)
+        ready = [math.inf] * len(self.station_ids)
+        arrived_by = [-1] * len(self.station_ids)
+        arrival[source] = ready[source] = start
+
+        departures, arrivals = self.departures, self.arrivals
+        sources, destinations = self.sources, self.destinations
+        for connection in range(bisect.bisect_left(departures, start), len(departures)):
+            departure = departures[connection]
+            if departure >= arrival[target] or departure > last_departure:
+                break
+            if departure < ready[sources[connection]]:
+                continue
+            to = destinations[connection]
+            if arrivals[connection] < arrival[to]:
+                arrival[to] = arrivals[connection]
+                ready[to] = arrivals[connection] + transfer
+                arrived_by[to] = connection
+
+        if arrived_by[target] == -1:
+            return None
+
+        legs = []
+        station = target
+        while station != source:
+            connection = arrived_by[station]
+            legs.append(self._leg(connection))
+            station = sources[connection]
+        legs.reverse()
+        return legs
+
+    def _leg(self, connection):
+        return {
+            "journey": self.journey_ids[connection],
+            "source": self.station_ids[self.sources[connection]],
+            "destination": self.station_ids[self.destinations[connection]],
+            "departure_time": datetime.fromtimestamp(self.departures[connection], timezone.utc),
+            "arrival_time": datetime.fromtimestamp(self.arrivals[connection], timezone.utc),
+        }
+
+
+timetable = VersionedSnapshot(TIMETABLE_VERSION, Timetable.from_database)
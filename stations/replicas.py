@@ -0,0 +1,88 @@
+"""Send reads of safe-method API requests to read replicas.
+
+``ReplicaReadMixin`` marks the viewset actions of ``GET``, ``HEAD`` and
+``OPTIONS`` requests as replica reads, and ``ReplicaRouter`` then picks one
+of ``DATABASE_REPLICAS`` for their queries. Writes always go to ``default``.
+A successful write marks its user for ``REPLICA_STICKY_SECONDS``; until
+then that user's reads stay on the primary, so they never see a replica
+that has not caught up with their own changes yet.
+
+Anything stored or tagged under a data version (cached responses,
+in-process snapshots, responses with an ETag) is built inside
+``read_from_primary()``: a lagging replica would otherwise store old rows
+under the new version for everyone.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def _sticky_key(user_id):
+    return f"stations:primary-reads:{user_id}"
+
+
+def recently_wrote(user):
+    if not user.is_authenticated:
+        return False
+    return caches[settings.REPLICA_CACHE].get(_sticky_key(user.pk)) is not None
+
+
+def mark_write(user):
+    if user.is_authenticated:
+        caches[settings.REPLICA_CACHE].set(
+            _sticky_key(user.pk), True, settings.REPLICA_STICKY_SECONDS
+        )
+
+
+@contextmanager
+def read_from_primary():
+    """Send the reads inside the block to ``default``, even in a replica request."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and _read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """Route the queries of safe-method actions to a read replica."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not recently_wrote(request.user):
+            self._replica_token = _read_from_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            _read_from_replica.reset(token)
+            self._replica_token = None
+        elif request.method not in SAFE_METHODS and response.status_code < 400:
+            mark_write(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,187 @@
+"""Typeahead search over station names.
+
+``StationNameIndex`` keeps the normalised (case-folded, accent-free) name
+of every station, and the same name starting at each of its later words,
+in one sorted list, so a prefix lookup is a binary search followed by a
+scan of just the matches it returns. When that finds too few stations, a
+trigram index proposes candidates that are then checked with an edit
+distance, which tolerates one typo in short queries and two in long ones.
+
+The index is rebuilt lazily after a station changes. Station tables
+larger than ``STATION_SEARCH_MAX_INDEXED`` are not indexed in memory;
+searches then run a prefix query backed by an ``UPPER(name)`` index
+(migration 0013, PostgreSQL only).
+"""
+
+import bisect
+import re
+import unicodedata
+from array import array
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from stations.caching import model_version_name
+from stations.models import Station
+from stations.versions import VersionedSnapshot
+
+_WORD = re.compile(r"[^\W_]+")
+
+# Names sharing the most trigrams with a query that are checked for typos.
+FUZZY_CANDIDATES = 64
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return " ".join(_WORD.findall(text))
+
+
+def trigrams(text):
+    padded = f"  {text}"
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def max_typos(query):
+    if len(query) < 4:
+        return 0
+    return 1 if len(query) < 8 else 2
+
+
+def prefix_distance(query, text, limit):
+    """Edit distance between ``query`` and the closest prefix of ``text``.
+
+    Adjacent transpositions count as one edit. Returns ``limit + 1`` as
+    soon as the distance is known to exceed ``limit``.
+    """
+    two_rows_up = None
+    previous = list(range(len(text) + 1))
+    for i in range(1, len(query) + 1):
+        current = [i] + [0] * len(text)
+        for j in range(1, len(text) + 1):
+            cost = query[i - 1] != text[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                two_rows_up is not None and j > 1
+                and query[i - 1] == text[j - 2] and query[i - 2] == text[j - 1]
+            ):
+                current[j] = min(current[j], two_rows_up[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        two_rows_up, previous = previous, current
+    # Column j holds the distance to the first j characters of ``text``.
+    return min(previous)
+
+
+class StationNameIndex:
+    def __init__(self, rows):
+        self.stations = []
+        # (key, station position); a key is the name from its first word
+        # (``names``) or from one of the following words (``inner``).
+        names, inner = [], []
+        for station_id, name, latitude, longitude in rows:
+            position = len(self.stations)
+            self.stations.append(
+                {"id": station_id, "name": name, "latitude": latitude, "longitude": longitude}
+            )
+            words = normalize(name).split(" ")
+            names.append((" ".join(words), position))
+            for start in range(1, len(words)):
+                inner.append((" ".join(words[start:]), position))
+
+        names.sort()
+        inner.sort()
+        self.name_keys = [key for key, _ in names]
+        self.name_stations = array("i", [position for _, position in names])
+        self.inner_keys = [key for key, _ in inner]
+        self.inner_stations = array("i", [position for _, position in inner])
+
+        postings = defaultdict(lambda: array("i"))
+        for position in range(len(self.name_keys)):
+            for trigram in trigrams(self.name_keys[position]):
+                postings[trigram].append(position)
+        self.postings = {
+            trigram: np.frombuffer(positions, dtype=np.int32)
+            for trigram, positions in postings.items()
+        }
+
+    @classmethod
+    def from_database(cls):
+        stations = Station.objects.values_list("id", "name", "latitude", "longitude")
+        if stations.count() > settings.STATION_SEARCH_MAX_INDEXED:
+            return None
+        return cls(stations.iterator(chunk_size=10_000))
+
+    def search(self, query, limit):
+        query = normalize(query)
+        if not query:
+            return []
+
+        found = []
+        seen = set()
+        for keys, positions in (
+            (self.name_keys, self.name_stations),
+            (self.inner_keys, self.inner_stations),
+        ):
+            index = bisect.bisect_left(keys, query)
+            while index < len(keys) and len(found) < limit and keys[index].startswith(query):
+                position = positions[index]
+                if position not in seen:
+                    seen.add(position)
+                    found.append(position)
+                index += 1
+
+        typos = max_typos(query)
+        if len(found) < limit and typos:
+            found.extend(self._fuzzy(query, typos, limit - len(found), seen))
+        return [self.stations[position] for position in found]
+
+    def _fuzzy(self, query, typos, limit, seen):
+        """Stations whose name starts with ``query`` give or take ``typos`` edits."""
+        matching = [
+            self.postings[trigram] for trigram in trigrams(query) if trigram in self.postings
+        ]
+        if not matching:
+            return []
+        shared = np.bincount(np.concatenate(matching), minlength=len(self.name_keys))
+        # Every edit changes at most three of the query's trigrams.
+        required = max(len(trigrams(query)) - 3 * typos, 1)
+        candidates = np.flatnonzero(shared >= required)
+        if len(candidates) > FUZZY_CANDIDATES:
+            best = np.argpartition(shared[candidates], -FUZZY_CANDIDATES)[-FUZZY_CANDIDATES:]
+            candidates = candidates[best]
+
+        matches = []
+        for key_index in candidates.tolist():
+            position = self.name_stations[key_index]
+            if position in seen:
+                continue
+            key = self.name_keys[key_index]
+            distance = prefix_distance(query, key[:len(query) + typos], typos)
+            if distance <= typos:
+                matches.append((distance, key, position))
+        matches.sort()
+        return [position for _, _, position in matches[:limit]]
+
+
+def search_database(query, limit):
+    """Prefix search through the database, for tables too large to index in memory."""
+    query = query.strip()
+    if not query:
+        return []
+    return list(
+        Station.objects.filter(name__istartswith=query)
+        .order_by("name", "id")
+        .values("id", "name", "latitude", "longitude")[:limit]
+    )
+
+
+station_names = VersionedSnapshot(model_version_name(Station), StationNameIndex.from_database)
+
+
+def search_stations(query, limit):
+    index = station_names.get()
+    if index is None:
+        return search_database(query, limit)
+    return index.search(query, limit)
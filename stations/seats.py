@@ -0,0 +1,123 @@
+class SeatMap:
+    """Bitset of taken seats, one bit per ``cargo * places_in_cargo`` seat.
+
+    Seat ``(cargo_number, seat_number)`` lives at bit
+    ``(cargo_number - 1) * places_in_cargo + seat_number - 1``; both
+    numbers are 1-based like on ``Ticket``.
+    """
+
+    def __init__(self, data, cargo, places_in_cargo):
+        self.cargo = cargo
+        self.places_in_cargo = places_in_cargo
+        size = (cargo * places_in_cargo + 7) // 8
+        self.bits = bytearray(bytes(data or b"")[:size].ljust(size, b"\0"))
+
+    def __bytes__(self):
+        return bytes(self.bits)
+
+    def _position(self, cargo_number, seat_number):
+        index = (cargo_number - 1) * self.places_in_cargo + seat_number - 1
+        return index >> 3, 1 << (index & 7)
+
+    def contains(self, cargo_number, seat_number):
+        return 1 <= cargo_number <= self.cargo and 1 <= seat_number <= self.places_in_cargo
+
+    def is_taken(self, cargo_number, seat_number):
+        byte, mask = self._position(cargo_number, seat_number)
+        return bool(self.bits[byte] & mask)
+
+    def take(self, cargo_number, seat_number):
+        byte, mask = self._position(cargo_number, seat_number)
+        self.bits[byte] |= mask
+
+    def release(self, cargo_number, seat_number):
+        byte, mask = self._position(cargo_number, seat_number)
+        self.bits[byte] &= ~mask
+
+    def taken_count(self):
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def free_count(self):
+        return self.cargo * self.places_in_cargo - self.taken_count()
+
+    def taken_seats(self):
+        """Yield ``(cargo_number, seat_number)`` of every taken seat in order."""
+        for byte, value in enumerate(self.bits):
+            if not value:
+                continue
+            for bit in range(8):
+                if value & (1 << bit):
+                    cargo_index, seat_index = divmod(byte * 8 + bit, self.places_in_cargo)
+                    yield cargo_index + 1, seat_index + 1
+
+    def free_runs(self, cargo_number):
+        """Return ``(first_seat_number, length)`` of free adjacent seats in a cargo."""
+        runs = []
+        start = None
+        for seat_number in range(1, self.places_in_cargo + 2):
+            free = seat_number <= self.places_in_cargo and not self.is_taken(cargo_number, seat_number)
+            if free and start is None:
+                start = seat_number
+            elif not free and start is not None:
+                runs.append((start, seat_number - start))
+                start = None
+        return runs
+
+    def allocate(self, count):
+        """Pick ``count`` free seats, preferring one cargo and adjacent seats.
+
+        Tries, in order: the tightest single run of adjacent seats that
+        fits, then the cargo that needs the fewest runs, then the fewest
+        cargos. Returns a list of ``(cargo_number, seat_number)`` or
+        ``None`` when the journey does not have enough free seats. The
+        picked seats are not marked as taken.
+        """
+        cargo_runs = {
+            cargo_number: sorted(self.free_runs(cargo_number), key=lambda run: -run[1])
+            for cargo_number in range(1, self.cargo + 1)
+        }
+        fitting = [
+            (length, cargo_number, start)
+            for cargo_number, runs in cargo_runs.items()
+            for start, length in runs
+            if length >= count
+        ]
+        if fitting:
+            _, cargo_number, start = min(fitting)
+            return [(cargo_number, start + offset) for offset in range(count)]
+
+        best = None
+        for cargo_number, runs in cargo_runs.items():
+            seats, runs_used = self._take_from_runs(cargo_number, runs, count)
+            if len(seats) == count and (best is None or runs_used < best[1]):
+                best = seats, runs_used
+        if best is not None:
+            return best[0]
+
+        cargos = sorted(
+            cargo_runs,
+            key=lambda cargo_number: -sum(length for _, length in cargo_runs[cargo_number]),
+        )
+        seats = []
+        for cargo_number in cargos:
+            cargo_seats, _ = self._take_from_runs(
+                cargo_number, cargo_runs[cargo_number], count - len(seats)
+            )
+            seats.extend(cargo_seats)
+            if len(seats) == count:
+                return seats
+        return None
+
+    @staticmethod
+    def _take_from_runs(cargo_number, runs, count):
+        seats = []
+        runs_used = 0
+        for start, length in runs:
+            if len(seats) == count:
+                break
+            runs_used += 1
+            seats.extend(
+                (cargo_number, seat_number)
+                for seat_number in range(start, start + min(length, count - len(seats)))
+            )
+        return seats, runs_used
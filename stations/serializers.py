@@ -1,8 +1,13 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.template.defaultfilters import first
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from stations import holds, metrics
+from stations.booking import create_tickets
+from stations.exceptions import SeatConflict
 from stations.models import Station, Crew, TrainType, Train, Route, Journey, Ticket, Order
 
 
@@ -12,6 +17,41 @@ class StationSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class NearbyStationSerializer(StationSerializer):
+    distance = serializers.FloatField(read_only=True, help_text="km")
+
+    class Meta(StationSerializer.Meta):
+        fields = ("id", "name", "latitude", "longitude", "distance")
+
+
+class StationNearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(required=False, min_value=0, help_text="km")
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=100)
+
+
+class StationSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, help_text="Beginning of a word of the station name")
+    limit = serializers.IntegerField(default=10, min_value=1, max_value=50)
+
+
+class StationWithinQuerySerializer(serializers.Serializer):
+    min_lat = serializers.FloatField(min_value=-90, max_value=90)
+    min_lon = serializers.FloatField(min_value=-180, max_value=180)
+    max_lat = serializers.FloatField(min_value=-90, max_value=90)
+    max_lon = serializers.FloatField(
+        min_value=-180,
+        max_value=180,
+        help_text="Smaller than min_lon for boxes crossing the antimeridian",
+    )
+
+    def validate(self, attrs):
+        if attrs["min_lat"] > attrs["max_lat"]:
+            raise serializers.ValidationError({"max_lat": "max_lat must not be below min_lat."})
+        return attrs
+
+
 class CrewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Crew
@@ -63,40 +103,181 @@ class RouteSerializer(serializers.ModelSerializer):
         fields = ("id", "distance", "source", "destination")
 
 
+class RouteKeyResolutionMixin:
+    """Resolves "Source -> Destination" keys through the indexed ``Route.key``.
+
+    Inside a ``JourneyBatchListSerializer`` the routes of the whole batch
+    have already been loaded and are looked up there instead.
+    """
+
+    ambiguous_message = "Several routes are named {value}; refer to the route by id."
+
+    def resolve_route_key(self, key):
+        resolved = getattr(self.root, "routes_by_key", None)
+        if resolved is None:
+            resolved = Route.resolve_keys([key])
+        routes = resolved.get(key, ())
+        if len(routes) > 1:
+            raise serializers.ValidationError(self.ambiguous_message.format(value=key), code="ambiguous")
+        return routes[0] if routes else None
+
+
+class RouteKeyRelatedField(RouteKeyResolutionMixin, serializers.SlugRelatedField):
+    """A route read and written as its "Source -> Destination" key."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("slug_field", "key")
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("invalid")
+        route = self.resolve_route_key(data)
+        if route is None:
+            self.fail("does_not_exist", slug_name=self.slug_field, value=data)
+        return route
+
+
+class JourneyRouteField(RouteKeyResolutionMixin, serializers.PrimaryKeyRelatedField):
+    """A route written as its id or as its "Source -> Destination" key."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) and not data.isdigit():
+            route = self.resolve_route_key(data)
+            if route is None:
+                self.fail("does_not_exist", pk_value=data)
+            return route
+        routes_by_id = getattr(self.root, "routes_by_id", {})
+        if str(data).isdigit() and int(data) in routes_by_id:
+            return routes_by_id[int(data)]
+        return super().to_internal_value(data)
+
+
+class JourneyBatchListSerializer(serializers.ListSerializer):
+    """Creates many journeys, loading the routes of all of them up front.
+
+    Route ids are fetched with one ``in_bulk`` and route keys with one
+    query on the indexed ``Route.key``, instead of a lookup per journey.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            routes = [item.get("route") for item in data if isinstance(item, dict)]
+            ids = {int(route) for route in routes if str(route).isdigit()}
+            keys = {route for route in routes if isinstance(route, str) and not route.isdigit()}
+            self.routes_by_id = Route.objects.in_bulk(ids) if ids else {}
+            self.routes_by_key = Route.resolve_keys(keys) if keys else {}
+        return super().to_internal_value(data)
+
+
 class JourneySerializer(serializers.ModelSerializer):
+    route = JourneyRouteField(
+        queryset=Route.objects.all(),
+        help_text='Route id, or its key "Source -> Destination"',
+    )
+
     class Meta:
         model = Journey
         fields = "__all__"
+        list_serializer_class = JourneyBatchListSerializer
+
+
+class JourneyPageListSerializer(serializers.ListSerializer):
+    """Loads the seat holds and the crew of every journey on the page at once."""
+
+    def to_representation(self, data):
+        journeys = list(data.all() if hasattr(data, "all") else data)
+        journey_ids = [journey.pk for journey in journeys]
+        self.child.held_seats = holds.held_seats(journey_ids)
+        self.child.crew_names = Journey.crew_names(journey_ids)
+        return super().to_representation(journeys)
 
 
 class JourneyListSerializer(JourneySerializer):
-    route = serializers.StringRelatedField(read_only=True)
-    train = serializers.StringRelatedField(read_only=True)
-    crew = serializers.StringRelatedField(read_only=True, many=True)
-    tickets_available = serializers.IntegerField(read_only=True)
+    """Expects a queryset passed through ``Journey.annotate_list_fields``."""
+
+    route = serializers.CharField(source="route_name", read_only=True)
+    train = serializers.CharField(source="train_name", read_only=True)
+    crew = serializers.SerializerMethodField()
+    tickets_available = serializers.SerializerMethodField()
+
     class Meta:
         model = Journey
-        fields = ("route", "train", "crew", "tickets_available")
+        fields = (
+            "id",
+            "route",
+            "train",
+            "crew",
+            "departure_time",
+            "arrival_time",
+            "tickets_available",
+        )
+        list_serializer_class = JourneyPageListSerializer
+
+    def get_crew(self, journey) -> list[str]:
+        crew_names = getattr(self, "crew_names", None)
+        if crew_names is None:
+            crew_names = Journey.crew_names([journey.pk])
+        return crew_names[journey.pk]
+
+    def get_tickets_available(self, journey) -> int:
+        held_seats = getattr(self, "held_seats", None)
+        if held_seats is None:
+            held_seats = holds.held_seats([journey.pk])
+        return journey.tickets_available - len(held_seats[journey.pk])
+
+
+class SeatSerializer(serializers.Serializer):
+    cargo_number = serializers.IntegerField()
+    seat_number = serializers.IntegerField()
 
 
 class JourneyDetailSerializer(serializers.ModelSerializer):
-    route = serializers.SlugRelatedField(
-        read_only=False,
-        slug_field="full_route",
-        queryset=Route.objects.all(),
-    )
+    route = RouteKeyRelatedField(queryset=Route.objects.all())
     train = serializers.StringRelatedField(read_only=True)
     crew = CrewSerializer(many=True, read_only=True)
-    taken_seats = serializers.SlugRelatedField(
-        source="tickets",
-        many=True,
-        read_only=True,
-        slug_field="seat_number",
-    )
+    taken_seats = serializers.SerializerMethodField()
+
     class Meta:
         model = Journey
         fields = ("route", "train", "crew", "taken_seats")
 
+    @extend_schema_field(SeatSerializer(many=True))
+    def get_taken_seats(self, journey):
+        taken_seats = set(journey.get_seat_map().taken_seats())
+        taken_seats.update(holds.held_seats([journey.pk])[journey.pk])
+        return [
+            {"cargo_number": cargo_number, "seat_number": seat_number}
+            for cargo_number, seat_number in sorted(taken_seats)
+        ]
+
+
+class JourneySeatMapSerializer(serializers.Serializer):
+    cargo = serializers.IntegerField()
+    places_in_cargo = serializers.IntegerField()
+    seat_map = serializers.CharField(
+        help_text="Base64 bitset, bit (cargo_number - 1) * places_in_cargo + seat_number - 1 "
+                  "is set for a taken seat"
+    )
+    taken_seats = SeatSerializer(many=True)
+    held_seats = SeatSerializer(many=True)
+
+
+class JourneyPlanQuerySerializer(serializers.Serializer):
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    departure_after = serializers.DateTimeField(required=False)
+    min_transfer = serializers.IntegerField(default=10, min_value=0, help_text="minutes")
+    max_hours = serializers.IntegerField(default=48, min_value=1, max_value=168)
+
+
+class JourneyPlanLegSerializer(serializers.Serializer):
+    journey = serializers.IntegerField()
+    source = serializers.IntegerField()
+    destination = serializers.IntegerField()
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+
 
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
@@ -116,20 +297,95 @@ class TicketSerializer(serializers.ModelSerializer):
         }
 
 
+class OrderTicketListSerializer(serializers.ListSerializer):
+    """Loads the journeys of every ticket in an order with one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            journey_ids = {
+                int(item["journey"]) for item in data
+                if isinstance(item, dict) and str(item.get("journey")).isdigit()
+            }
+            # Booking locks and reloads the journeys; only their ids are needed here.
+            self.child.journeys_by_id = (
+                Journey.objects.only("id").in_bulk(journey_ids) if journey_ids else {}
+            )
+        return super().to_internal_value(data)
+
+
+class OrderTicketJourneyField(serializers.PrimaryKeyRelatedField):
+    def to_internal_value(self, data):
+        journeys_by_id = getattr(self.parent, "journeys_by_id", {})
+        if str(data).isdigit() and int(data) in journeys_by_id:
+            return journeys_by_id[int(data)]
+        return super().to_internal_value(data)
+
+
+class OrderTicketSerializer(TicketSerializer):
+    """Ticket nested in an order; its seat is checked by Ticket.validate_tickets."""
+
+    journey = OrderTicketJourneyField(queryset=Journey.objects.all())
+
+    def validate(self, attrs):
+        return super(TicketSerializer, self).validate(attrs=attrs)
+
+    class Meta(TicketSerializer.Meta):
+        validators = []
+        list_serializer_class = OrderTicketListSerializer
+
+
+class SeatHoldSerializer(serializers.Serializer):
+    hold = serializers.CharField(read_only=True)
+    seats = SeatSerializer(many=True, allow_empty=False, max_length=settings.SEAT_HOLD_MAX_SEATS)
+    seconds = serializers.IntegerField(default=90, min_value=1, max_value=900, write_only=True)
+    expires_at = serializers.DateTimeField(read_only=True)
+
+
+class SeatAllocationSerializer(serializers.Serializer):
+    journey = serializers.PrimaryKeyRelatedField(queryset=Journey.objects.all())
+    seats = serializers.IntegerField(min_value=1)
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
+    tickets = OrderTicketSerializer(many=True, read_only=False, required=False)
+    allocate = SeatAllocationSerializer(
+        many=True,
+        write_only=True,
+        required=False,
+        help_text="Number of seats to pick per journey, same cargo and adjacent seats first",
+    )
+    hold = serializers.CharField(
+        write_only=True,
+        required=False,
+        help_text="Id of a seat hold of the current user to turn into tickets",
+    )
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = ("id", "tickets", "allocate", "hold", "created_at")
+
+    def validate(self, attrs):
+        data = super(OrderSerializer, self).validate(attrs=attrs)
+        if not attrs.get("tickets") and not attrs.get("allocate") and not attrs.get("hold"):
+            raise serializers.ValidationError(
+                {"tickets": "Order must contain tickets, a seat allocation or a seat hold."}
+            )
+        return data
 
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+        tickets_data = validated_data.pop("tickets", [])
+        allocations = validated_data.pop("allocate", [])
+        hold_id = validated_data.pop("hold", None)
+        try:
+            with transaction.atomic():
+                order = Order.objects.create(**validated_data)
+                create_tickets(order, tickets_data, allocations, hold_id)
+                return order
+        except IntegrityError:
+            # Only reachable when a ticket was written without the journey
+            # lock; report it like any other lost race instead of a 500.
+            metrics.incr("booking_conflicts")
+            raise SeatConflict()
 
 
 class OrderListSerializer(serializers.ModelSerializer):
@@ -0,0 +1,132 @@
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from stations.caching import model_version_name
+from stations.models import Station, Route, Crew, TrainType, Train, Journey, Ticket
+from stations.planner import TIMETABLE_VERSION
+from stations.versions import invalidate
+
+
+def _previous_values(instance, *fields):
+    if instance._state.adding or instance.pk is None:
+        return None
+    return type(instance).objects.filter(pk=instance.pk).values_list(*fields).first()
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_seat(sender, instance, **kwargs):
+    instance._previous_seat = _previous_values(
+        instance, "journey_id", "cargo_number", "seat_number"
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def take_ticket_seat(sender, instance, created, **kwargs):
+    seat = (instance.journey_id, instance.cargo_number, instance.seat_number)
+    previous = getattr(instance, "_previous_seat", None)
+    if created or previous is None:
+        Journey.update_seats(instance.journey_id, taken=[seat[1:]])
+    elif previous != seat:
+        Journey.update_seats(previous[0], released=[previous[1:]])
+        Journey.update_seats(instance.journey_id, taken=[seat[1:]])
+
+
+def _deleted_with_journey(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Station, Route, TrainType, Train, Journey)
+
+
+@receiver(post_delete, sender=Ticket)
+def release_ticket_seat(sender, instance, origin=None, **kwargs):
+    if origin is not None and _deleted_with_journey(origin):
+        return
+    Journey.update_seats(
+        instance.journey_id,
+        released=[(instance.cargo_number, instance.seat_number)],
+    )
+
+
+@receiver(pre_save, sender=Journey)
+def remember_journey_train(sender, instance, **kwargs):
+    instance._previous_train = _previous_values(instance, "train_id")
+
+
+@receiver(post_save, sender=Journey)
+def rebuild_journey_seats(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_train", None)
+    if not created and previous is not None and previous != (instance.train_id,):
+        with transaction.atomic():
+            Journey.rebuild_seat_inventory(Journey.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Train)
+def remember_train_layout(sender, instance, **kwargs):
+    instance._previous_layout = _previous_values(instance, "cargo", "places_in_cargo")
+
+
+@receiver(pre_save, sender=Station)
+def remember_station_name(sender, instance, **kwargs):
+    instance._previous_name = _previous_values(instance, "name")
+
+
+@receiver(post_save, sender=Station)
+def refresh_route_keys(sender, instance, created, raw, **kwargs):
+    previous = getattr(instance, "_previous_name", None)
+    renamed = not created and previous is not None and previous != (instance.name,)
+    if raw or renamed:
+        Route.refresh_keys(Route.objects.filter(Q(source=instance) | Q(destination=instance)))
+        invalidate(model_version_name(Route))
+
+
+@receiver(post_save, sender=Route)
+def fill_loaded_route_key(sender, instance, raw, **kwargs):
+    # loaddata saves rows without calling Route.save(), which sets the key.
+    if raw:
+        Route.refresh_keys(Route.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Train)
+def rebuild_train_seats(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_layout", None)
+    if not created and previous is not None and previous != (instance.cargo, instance.places_in_cargo):
+        with transaction.atomic():
+            Journey.rebuild_seat_inventory(Journey.objects.filter(train=instance))
+
+
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Journey)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def invalidate_timetable(sender, **kwargs):
+    invalidate(TIMETABLE_VERSION)
+
+
+@receiver(post_save, sender=Station)
+@receiver(post_delete, sender=Station)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Train)
+@receiver(post_delete, sender=Train)
+@receiver(post_save, sender=TrainType)
+@receiver(post_delete, sender=TrainType)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(model_version_name(sender))
+
+
+@receiver(post_save, sender=Journey)
+@receiver(post_delete, sender=Journey)
+def invalidate_journey(sender, instance, **kwargs):
+    invalidate(Journey.version_name(instance.pk))
+
+
+@receiver(m2m_changed, sender=Journey.crew.through)
+def invalidate_journey_crew(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    journey_ids = (pk_set or ()) if reverse else [instance.pk]
+    for journey_id in journey_ids:
+        invalidate(Journey.version_name(journey_id))
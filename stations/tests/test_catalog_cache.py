@@ -0,0 +1,137 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations import metrics
+from stations.models import Station, Route, Journey
+from stations.tests.test_journey_api import sample_journey
+from stations.versions import peek_version
+
+
+STATION_URL = reverse("stations:station-list")
+ROUTE_URL = reverse("stations:route-list")
+METRICS_URL = reverse("stations:metrics")
+
+
+class CatalogResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        self.lviv = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+    def test_list_served_from_cache(self):
+        first = self.client.get(STATION_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(STATION_URL)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+
+    def test_cache_keyed_by_query_string(self):
+        self.client.get(STATION_URL, {"limit": 1})
+
+        response = self.client.get(STATION_URL, {"limit": 2})
+
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_related_model_change_invalidates(self):
+        Route.objects.create(source=self.kyiv, destination=self.lviv, distance=540)
+        self.client.get(ROUTE_URL)
+
+        self.lviv.name = "Lemberg"
+        self.lviv.save()
+        response = self.client.get(ROUTE_URL)
+
+        self.assertEqual(response.data["results"][0]["destination"], "Lemberg")
+
+    def test_hit_ratio_exposed(self):
+        self.client.get(STATION_URL)
+        self.client.get(STATION_URL)
+        self.client.get(STATION_URL)
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertAlmostEqual(response.data["response_cache_hit_ratio"], 2 / 3)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+        self.journey_url = reverse("stations:journey-detail", kwargs={"pk": self.journey.pk})
+
+    def test_route_list_not_modified(self):
+        etag = self.client.get(ROUTE_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(ROUTE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_route_list_etag_changes_with_station(self):
+        etag = self.client.get(ROUTE_URL)["ETag"]
+        self.journey.route.source.name = "Kyiv-Pasazhyrskyi"
+        self.journey.route.source.save()
+
+        response = self.client.get(ROUTE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_journey_detail_etag_changes_with_booking(self):
+        etag = self.client.get(self.journey_url)["ETag"]
+        self.assertEqual(
+            self.client.get(self.journey_url, HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        self.client.post(
+            reverse("stations:order-list"),
+            {"tickets": [{"cargo_number": 1, "seat_number": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+        response = self.client.get(self.journey_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["taken_seats"], [{"cargo_number": 1, "seat_number": 1}])
+
+    def test_journey_detail_etag_changes_with_hold(self):
+        etag = self.client.get(self.journey_url)["ETag"]
+        self.client.post(
+            reverse("stations:journey-hold", kwargs={"pk": self.journey.pk}),
+            {"seats": [{"cargo_number": 1, "seat_number": 2}]},
+            format="json",
+        )
+
+        response = self.client.get(self.journey_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_journey_does_not_seed_version(self):
+        for journey_id in ("123456789", "notanint"):
+            response = self.client.get(
+                reverse("stations:journey-detail", kwargs={"pk": journey_id})
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertIsNone(peek_version(Journey.version_name(journey_id)))
@@ -0,0 +1,416 @@
+import base64
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Station, Route, Crew, Train, TrainType, Journey, Order, Ticket
+from stations.seats import SeatMap
+from stations.serializers import JourneyListSerializer
+
+
+JOURNEY_URL = reverse("stations:journey-list")
+ORDER_URL = reverse("stations:order-list")
+TICKET_URL = reverse("stations:ticket-list")
+
+
+def sample_journey(**params):
+    source = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+    destination = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+    route = Route.objects.create(source=source, destination=destination, distance=540)
+    train = Train.objects.create(name="Intercity", cargo=2, places_in_cargo=10)
+    defaults = {
+        "route": route,
+        "train": train,
+        "departure_time": datetime(2026, 1, 1, 8, tzinfo=timezone.utc),
+        "arrival_time": datetime(2026, 1, 1, 13, tzinfo=timezone.utc),
+    }
+    defaults.update(params)
+    return Journey.objects.create(**defaults)
+
+
+class JourneyTicketsSoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def test_order_increments_tickets_sold(self):
+        payload = {
+            "tickets": [
+                {"cargo_number": 1, "seat_number": 1, "journey": self.journey.id},
+                {"cargo_number": 1, "seat_number": 2, "journey": self.journey.id},
+            ]
+        }
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+        self.journey.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.journey.tickets_sold, 2)
+
+    def test_ticket_delete_decrements_tickets_sold(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(cargo_number=1, seat_number=1, journey=self.journey, order=order)
+        Ticket.objects.create(cargo_number=1, seat_number=2, journey=self.journey, order=order)
+
+        order.delete()
+        self.journey.refresh_from_db()
+
+        self.assertEqual(self.journey.tickets_sold, 0)
+
+    def test_list_tickets_available(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(cargo_number=1, seat_number=1, journey=self.journey, order=order)
+
+        response = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["tickets_available"], 19)
+
+    def test_rebuild_seat_inventory_command(self):
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(cargo_number=1, seat_number=1, journey=self.journey, order=order)
+        Journey.objects.update(tickets_sold=42)
+
+        out = StringIO()
+        call_command("rebuild_seat_inventory", stdout=out)
+        self.journey.refresh_from_db()
+
+        self.assertEqual(self.journey.tickets_sold, 1)
+        self.assertIn("Rebuilt seat inventory for 1 journeys", out.getvalue())
+
+
+class SeatInventoryTransactionTests(TransactionTestCase):
+    """Runs without the test-wide transaction, like requests in autocommit mode."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+        self.order = Order.objects.create(user=self.user)
+        # SQLite ignores select_for_update(); make it enforce the
+        # transaction requirement like PostgreSQL, without the SQL clause.
+        for patcher in (
+            mock.patch.object(connection.features, "has_select_for_update", True),
+            mock.patch.object(connection.features, "has_select_for_update_of", True),
+            mock.patch.object(connection.ops, "for_update_sql", return_value=""),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def ticket_payload(self, seat_number):
+        return {
+            "cargo_number": 1,
+            "seat_number": seat_number,
+            "journey": self.journey.id,
+            "order": self.order.id,
+        }
+
+    def test_ticket_writes_update_seat_map(self):
+        response = self.client.post(TICKET_URL, self.ticket_payload(1), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        ticket_url = reverse("stations:ticket-detail", kwargs={"pk": Ticket.objects.get().pk})
+
+        response = self.client.put(ticket_url, self.ticket_payload(2), format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.journey.refresh_from_db()
+        self.assertEqual(list(self.journey.get_seat_map().taken_seats()), [(1, 2)])
+        self.assertEqual(self.journey.tickets_sold, 1)
+
+        response = self.client.delete(ticket_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 0)
+
+    def test_failed_seat_update_rolls_back_ticket(self):
+        with mock.patch.object(Journey, "save_seat_map", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(TICKET_URL, self.ticket_payload(1), format="json")
+
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_train_layout_change_through_api_rebuilds_locked_seat_map(self):
+        self.client.post(TICKET_URL, self.ticket_payload(3), format="json")
+        train_url = reverse("stations:train-detail", kwargs={"pk": self.journey.train_id})
+
+        with mock.patch.object(
+            Journey, "lock_for_booking", wraps=Journey.lock_for_booking
+        ) as lock_for_booking:
+            response = self.client.patch(train_url, {"places_in_cargo": 20}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lock_for_booking.assert_called_once_with([self.journey.pk])
+        self.journey.refresh_from_db()
+        self.assertEqual(list(self.journey.get_seat_map().taken_seats()), [(1, 3)])
+        self.assertEqual(self.journey.tickets_sold, 1)
+
+    def test_rebuild_command_locks_journeys(self):
+        self.client.post(TICKET_URL, self.ticket_payload(3), format="json")
+        Journey.objects.update(tickets_sold=42)
+
+        call_command("rebuild_seat_inventory", stdout=StringIO())
+
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 1)
+
+
+class JourneyPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_journeys_paginated_by_departure_time_cursor(self):
+        journeys = [
+            sample_journey(departure_time=datetime(2026, 1, day, 8, tzinfo=timezone.utc))
+            for day in (3, 1, 2)
+        ]
+
+        first_page = self.client.get(JOURNEY_URL, {"page_size": 2})
+        second_page = self.client.get(first_page.data["next"])
+
+        self.assertEqual(first_page.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", first_page.data)
+        self.assertEqual(
+            [journey["route"] for journey in first_page.data["results"]],
+            [str(journeys[1].route), str(journeys[2].route)],
+        )
+        self.assertEqual(len(second_page.data["results"]), 1)
+        self.assertIsNone(second_page.data["next"])
+
+    def test_pages_through_equal_departure_times_without_offset(self):
+        first = sample_journey()
+        Journey.objects.bulk_create([
+            Journey(
+                route=first.route,
+                train=first.train,
+                departure_time=first.departure_time,
+                arrival_time=first.arrival_time,
+            )
+            for _ in range(24)
+        ])
+
+        pages = []
+        url = JOURNEY_URL + "?page_size=10"
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                response = self.client.get(url)
+                pages.append([journey["id"] for journey in response.data["results"]])
+                url = response.data["next"]
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(
+            [journey_id for page in pages for journey_id in page],
+            list(Journey.objects.order_by("id").values_list("id", flat=True)),
+        )
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries.captured_queries))
+
+        previous_page = self.client.get(response.data["previous"])
+        self.assertEqual([journey["id"] for journey in previous_page.data["results"]], pages[1])
+
+    def test_invalid_cursor(self):
+        cursor = base64.b64encode(b"p=%5B%22yesterday%22%2C+%221%22%5D").decode()
+
+        response = self.client.get(JOURNEY_URL, {"cursor": cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class JourneyListDisplayTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+        self.crew = [
+            Crew.objects.create(first_name="Lesya", last_name="Ukrainka"),
+            Crew.objects.create(first_name="Ivan", last_name="Franko"),
+        ]
+        self.journey.crew.set(self.crew)
+
+    def test_display_strings_match_str(self):
+        self.journey.train.train_type = TrainType.objects.create(name="Express")
+        self.journey.train.save()
+
+        response = self.client.get(JOURNEY_URL)
+        journey = response.data["results"][0]
+
+        self.assertEqual(journey["route"], str(self.journey.route))
+        self.assertEqual(journey["train"], str(Train.objects.get(pk=self.journey.train_id)))
+        self.assertEqual(journey["crew"], [str(member) for member in self.crew])
+
+    def test_display_strings_without_train_type(self):
+        response = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(response.data["results"][0]["train"], str(self.journey.train))
+
+    def test_page_of_1000_journeys_query_budget(self):
+        Journey.objects.bulk_create([
+            Journey(
+                route=self.journey.route,
+                train=self.journey.train,
+                departure_time=datetime(2026, 2, 1, tzinfo=timezone.utc),
+                arrival_time=datetime(2026, 2, 1, 5, tzinfo=timezone.utc),
+            )
+            for _ in range(999)
+        ])
+        journeys = Journey.annotate_list_fields(Journey.objects.all()).order_by("departure_time", "id")
+
+        # One query for the journeys with their names, one for the crews.
+        with self.assertNumQueries(2):
+            data = JourneyListSerializer(journeys, many=True).data
+
+        self.assertEqual(len(data), 1000)
+        self.assertEqual(data[0]["crew"], ["Lesya Ukrainka", "Ivan Franko"])
+        self.assertEqual(data[-1]["route"], "Kyiv → Lviv")
+
+
+class JourneyFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.morning = sample_journey()
+        self.evening = sample_journey(
+            route=self.morning.route,
+            departure_time=datetime(2026, 1, 1, 20, tzinfo=timezone.utc),
+            arrival_time=datetime(2026, 1, 2, 1, tzinfo=timezone.utc),
+        )
+        self.other = sample_journey()
+
+    def journey_ids(self, params):
+        response = self.client.get(JOURNEY_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {journey["id"] for journey in response.data["results"]}
+
+    def test_filter_by_source_and_destination(self):
+        route = self.morning.route
+
+        ids = self.journey_ids({"source": route.source_id, "destination": route.destination_id})
+
+        self.assertEqual(ids, {self.morning.id, self.evening.id})
+
+    def test_filter_by_route(self):
+        ids = self.journey_ids({"route": self.other.route_id})
+
+        self.assertEqual(ids, {self.other.id})
+
+    def test_filter_by_departure_window(self):
+        ids = self.journey_ids({
+            "route": self.morning.route_id,
+            "departure_after": "2026-01-01T12:00:00Z",
+            "departure_before": "2026-01-02T00:00:00Z",
+        })
+
+        self.assertEqual(ids, {self.evening.id})
+
+    def test_filter_invalid_ids(self):
+        for name, value in (("source", "abc"), ("destination", "x"), ("route", "1,a")):
+            response = self.client.get(JOURNEY_URL, {name: value})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(name, response.data)
+
+    def test_filter_invalid_departure(self):
+        response = self.client.get(JOURNEY_URL, {"departure_after": "tomorrow"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SeatMapTests(SimpleTestCase):
+    def test_take_and_release(self):
+        seat_map = SeatMap(b"", cargo=3, places_in_cargo=5)
+
+        seat_map.take(2, 5)
+        seat_map.take(3, 1)
+        seat_map.release(3, 1)
+
+        self.assertTrue(seat_map.is_taken(2, 5))
+        self.assertFalse(seat_map.is_taken(3, 1))
+        self.assertEqual(list(seat_map.taken_seats()), [(2, 5)])
+        self.assertEqual(seat_map.taken_count(), 1)
+        self.assertEqual(len(bytes(seat_map)), 2)
+
+
+class JourneySeatMapApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+        self.order = Order.objects.create(user=self.user)
+
+    def test_seat_map_tracks_ticket_writes(self):
+        Ticket.objects.create(cargo_number=2, seat_number=3, journey=self.journey, order=self.order)
+        ticket = Ticket.objects.create(
+            cargo_number=1, seat_number=1, journey=self.journey, order=self.order
+        )
+        ticket.seat_number = 4
+        ticket.save()
+
+        response = self.client.get(
+            reverse("stations:journey-seat-map", kwargs={"pk": self.journey.pk})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["taken_seats"],
+            [{"cargo_number": 1, "seat_number": 4}, {"cargo_number": 2, "seat_number": 3}],
+        )
+        self.assertEqual(base64.b64decode(response.data["seat_map"]), b"\x08\x10\x00")
+
+        ticket.delete()
+        self.journey.refresh_from_db()
+        self.assertEqual(list(self.journey.get_seat_map().taken_seats()), [(2, 3)])
+
+    def test_journey_detail_taken_seats(self):
+        Ticket.objects.create(cargo_number=2, seat_number=3, journey=self.journey, order=self.order)
+
+        response = self.client.get(
+            reverse("stations:journey-detail", kwargs={"pk": self.journey.pk})
+        )
+
+        self.assertEqual(response.data["taken_seats"], [{"cargo_number": 2, "seat_number": 3}])
+
+    def test_train_layout_change_rebuilds_seat_map(self):
+        Ticket.objects.create(cargo_number=2, seat_number=3, journey=self.journey, order=self.order)
+        train = self.journey.train
+
+        train.places_in_cargo = 20
+        train.save()
+        self.journey.refresh_from_db()
+
+        self.assertEqual(list(self.journey.get_seat_map().taken_seats()), [(2, 3)])
+        self.assertEqual(self.journey.tickets_sold, 1)
@@ -0,0 +1,205 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations import metrics
+from stations.models import Order, Ticket
+from stations.tests.test_journey_api import sample_journey
+
+
+ORDER_URL = reverse("stations:order-list")
+METRICS_URL = reverse("stations:metrics")
+
+
+def tickets_payload(journey, seats):
+    return {
+        "tickets": [
+            {"cargo_number": cargo_number, "seat_number": seat_number, "journey": journey.id}
+            for cargo_number, seat_number in seats
+        ]
+    }
+
+
+class OrderCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def test_create_order_inserts_tickets_in_bulk(self):
+        small = tickets_payload(self.journey, [(1, 1)])
+        large = tickets_payload(self.journey, [(2, seat) for seat in range(1, 11)])
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.post(ORDER_URL, small, format="json")
+        with CaptureQueriesContext(connection) as large_queries:
+            response = self.client.post(ORDER_URL, large, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 11)
+        inserts = [
+            query for query in large_queries
+            if query["sql"].startswith('INSERT INTO "stations_ticket"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        # The journeys of all nested tickets are loaded with one query.
+        self.assertEqual(len(large_queries), len(small_queries))
+
+    def test_create_order_unknown_journey(self):
+        payload = tickets_payload(self.journey, [(1, 1)])
+        payload["tickets"].append({"cargo_number": 1, "seat_number": 2, "journey": 999999})
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("journey", response.data["tickets"][1])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_create_order_seat_out_of_range(self):
+        payload = tickets_payload(self.journey, [(1, 11)])
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["seat_number"], "seat_number must be between 1 and 10"
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_create_order_taken_seat(self):
+        self.client.post(ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json")
+
+        response = self.client.post(
+            ORDER_URL, tickets_payload(self.journey, [(1, 2), (1, 1)]), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["conflicting_seats"],
+            [{"journey": self.journey.id, "cargo_number": 1, "seat_number": 1}],
+        )
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_booking_metrics(self):
+        metrics.reset()
+        self.client.post(ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json")
+        self.client.post(ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json")
+
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["counters"]["booking_lock_waits"], 2)
+        self.assertEqual(response.data["counters"]["booking_conflicts"], 1)
+        self.assertEqual(
+            response.data["hot_journeys"]["booking_conflicting_seats"],
+            [{"journey": self.journey.id, "value": 1}],
+        )
+        self.assertIn("database_pools", response.data)
+
+    def test_create_order_duplicate_seat_in_payload(self):
+        payload = tickets_payload(self.journey, [(1, 1), (1, 1)])
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+
+class OrderSeatAllocationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def test_allocate_adjacent_seats_in_one_cargo(self):
+        self.client.post(
+            ORDER_URL, tickets_payload(self.journey, [(1, 3), (2, 8)]), format="json"
+        )
+
+        response = self.client.post(
+            ORDER_URL, {"allocate": [{"journey": self.journey.id, "seats": 4}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(ticket["cargo_number"], ticket["seat_number"]) for ticket in response.data["tickets"]],
+            [(1, 4), (1, 5), (1, 6), (1, 7)],
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.tickets_sold, 6)
+
+    def test_allocate_together_with_chosen_seats(self):
+        payload = tickets_payload(self.journey, [(1, 1)])
+        payload["allocate"] = [{"journey": self.journey.id, "seats": 2}]
+
+        response = self.client.post(ORDER_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertEqual(
+            set(Ticket.objects.values_list("cargo_number", "seat_number")),
+            {(1, 1), (1, 2), (1, 3)},
+        )
+
+    def test_allocate_more_seats_than_left(self):
+        response = self.client.post(
+            ORDER_URL, {"allocate": [{"journey": self.journey.id, "seats": 21}]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_order_requires_tickets_or_allocation(self):
+        response = self.client.post(ORDER_URL, {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def create_orders(self, count):
+        for _ in range(count):
+            order = Order.objects.create(user=self.user)
+            seat_number = Ticket.objects.count() + 1
+            Ticket.objects.create(
+                cargo_number=1 + seat_number // 10,
+                seat_number=1 + seat_number % 10,
+                journey=self.journey,
+                order=order,
+            )
+
+    def test_order_list_query_count_is_constant(self):
+        self.create_orders(1)
+        with CaptureQueriesContext(connection) as few_orders:
+            self.client.get(ORDER_URL, {"page_size": 20})
+
+        self.create_orders(9)
+        with CaptureQueriesContext(connection) as many_orders:
+            response = self.client.get(ORDER_URL, {"page_size": 20})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(len(few_orders), len(many_orders))
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Station, Route, Train, Journey
+from stations.planner import Timetable
+
+
+PLAN_URL = reverse("stations:journey-plan")
+KYIV, VINNYTSIA, LVIV, ODESA = 1, 2, 3, 4
+
+
+def at(hour, minute=0):
+    return datetime(2026, 1, 1, hour, minute, tzinfo=timezone.utc)
+
+
+class TimetableTests(SimpleTestCase):
+    def setUp(self):
+        self.timetable = Timetable([
+            (10, KYIV, VINNYTSIA, at(8), at(10)),
+            (11, VINNYTSIA, LVIV, at(10, 5), at(13)),
+            (12, VINNYTSIA, LVIV, at(10, 30), at(13, 30)),
+            (13, KYIV, LVIV, at(9), at(15)),
+            (14, LVIV, ODESA, at(16), at(23)),
+        ])
+
+    def plan(self, source, destination, departure_after=at(0), min_transfer=15):
+        return self.timetable.earliest_arrival(
+            source,
+            destination,
+            departure_after,
+            min_transfer=timedelta(minutes=min_transfer),
+            horizon=timedelta(hours=48),
+        )
+
+    def test_transfer_respects_min_transfer_time(self):
+        legs = self.plan(KYIV, LVIV)
+
+        self.assertEqual([leg["journey"] for leg in legs], [10, 12])
+        self.assertEqual(legs[-1]["arrival_time"], at(13, 30))
+
+    def test_short_transfer_allowed(self):
+        legs = self.plan(KYIV, LVIV, min_transfer=5)
+
+        self.assertEqual([leg["journey"] for leg in legs], [10, 11])
+
+    def test_direct_journey_when_transfer_missed(self):
+        legs = self.plan(KYIV, LVIV, departure_after=at(8, 30))
+
+        self.assertEqual([leg["journey"] for leg in legs], [13])
+
+    def test_multiple_transfers(self):
+        legs = self.plan(KYIV, ODESA)
+
+        self.assertEqual([leg["journey"] for leg in legs], [10, 12, 14])
+
+    def test_no_connection(self):
+        self.assertIsNone(self.plan(ODESA, KYIV))
+        self.assertIsNone(self.plan(KYIV, 999))
+
+
+class JourneyPlanApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        vinnytsia = Station.objects.create(name="Vinnytsia", latitude=49.23, longitude=28.47)
+        self.lviv = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+        train = Train.objects.create(name="Intercity", cargo=2, places_in_cargo=10)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first = Journey.objects.create(
+                route=Route.objects.create(source=kyiv, destination=vinnytsia, distance=260),
+                train=train,
+                departure_time=at(8),
+                arrival_time=at(10),
+            )
+            self.second = Journey.objects.create(
+                route=Route.objects.create(source=vinnytsia, destination=self.lviv, distance=360),
+                train=train,
+                departure_time=at(11),
+                arrival_time=at(15),
+            )
+        self.kyiv = kyiv
+
+    def test_plan_with_transfer(self):
+        response = self.client.get(PLAN_URL, {
+            "source": self.kyiv.id,
+            "destination": self.lviv.id,
+            "departure_after": "2026-01-01T07:00:00Z",
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["transfers"], 1)
+        self.assertEqual(
+            [leg["journey"] for leg in response.data["legs"]],
+            [self.first.id, self.second.id],
+        )
+
+    def test_plan_not_found(self):
+        response = self.client.get(PLAN_URL, {
+            "source": self.lviv.id,
+            "destination": self.kyiv.id,
+            "departure_after": "2026-01-01T07:00:00Z",
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_plan_requires_stations(self):
+        response = self.client.get(PLAN_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,72 @@
+import io
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from railwayAPI.renderers import ORJSONParser, ORJSONRenderer
+from stations.models import Order, Ticket
+from stations.tests.test_journey_api import sample_journey
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_native_values(self):
+        self.assertSameOutput({
+            "name": "Київ → Львів\u2028\u2029\n\x01",
+            "distance": 540.25,
+            "latitude": 50.4501,
+            "places": [1, 2, 3],
+            "image": None,
+            "active": True,
+        })
+
+    def test_values_handled_by_drf_encoder(self):
+        self.assertSameOutput({
+            "departure_time": datetime(2026, 1, 1, 8, 30, tzinfo=timezone.utc),
+            "arrival_time": datetime(2026, 1, 1, 8, 30, 15, 250, tzinfo=timezone.utc),
+            "detail": gettext_lazy("Not found."),
+            1: "non string key",
+        })
+
+    def test_indented_output_falls_back(self):
+        data = {"a": [1, 2]}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+    def test_parser(self):
+        body = '{"tickets": [{"seat_number": 1}], "name": "Львів"}'.encode()
+
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+
+class ORJSONRendererPayloadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=self.user)
+        journey = sample_journey()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(cargo_number=1, seat_number=2, journey=journey, order=order)
+
+    def test_journey_and_order_lists(self):
+        for url in (reverse("stations:journey-list"), reverse("stations:order-list")):
+            data = self.client.get(url).data
+
+            self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
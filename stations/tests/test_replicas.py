@@ -0,0 +1,93 @@
+import random
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Journey
+from stations.replicas import ReplicaRouter
+from stations.tests.test_journey_api import sample_journey
+from stations.tests.test_order_api import tickets_payload
+
+
+JOURNEY_URL = reverse("stations:journey-list")
+STATION_URL = reverse("stations:station-list")
+NEARBY_URL = reverse("stations:station-nearby")
+ORDER_URL = reverse("stations:order-list")
+
+
+# The default alias stands in for a replica, so queries run normally and
+# only the router's choice of replica is observed.
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        caches[settings.REPLICA_CACHE].clear()
+        caches[settings.RESPONSE_CACHE].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def get(self, url):
+        with mock.patch("stations.replicas.random.choice", wraps=random.choice) as choice:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return choice.called
+
+    def test_safe_method_reads_from_replica(self):
+        self.assertTrue(self.get(JOURNEY_URL))
+        self.assertTrue(self.get(ORDER_URL))
+
+    def test_response_cache_fill_reads_from_primary(self):
+        self.assertFalse(self.get(STATION_URL))
+
+    def test_snapshot_rebuild_reads_from_primary(self):
+        self.assertFalse(self.get(f"{NEARBY_URL}?lat=50&lon=30"))
+
+    def test_etagged_detail_reads_from_primary(self):
+        self.assertFalse(
+            self.get(reverse("stations:journey-detail", kwargs={"pk": self.journey.pk}))
+        )
+
+    def test_write_goes_to_primary(self):
+        with mock.patch("stations.replicas.random.choice", wraps=random.choice) as choice:
+            response = self.client.post(
+                ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        choice.assert_not_called()
+
+    def test_reads_stay_on_primary_after_own_write(self):
+        self.client.post(ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json")
+
+        self.assertFalse(self.get(ORDER_URL))
+
+        other = get_user_model().objects.create_user(email="<OTHER_EMAIL>", password="<PASSWORD>")
+        self.client.force_authenticate(user=other)
+        self.assertTrue(self.get(ORDER_URL))
+
+    def test_failed_write_does_not_pin_reads(self):
+        self.client.post(ORDER_URL, tickets_payload(self.journey, [(1, 99)]), format="json")
+
+        self.assertTrue(self.get(ORDER_URL))
+
+
+class ReplicaRouterTests(TestCase):
+    @override_settings(DATABASE_REPLICAS=["replica"])
+    def test_writes_and_migrations_stay_on_default(self):
+        router = ReplicaRouter()
+
+        self.assertEqual(router.db_for_read(Journey), "default")
+        self.assertEqual(router.db_for_write(Journey), "default")
+        self.assertFalse(router.allow_migrate("replica", "stations"))
+        self.assertIsNone(router.allow_migrate("default", "stations"))
@@ -0,0 +1,174 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Station, Route, Train, Crew, Journey
+from stations.serializers import JourneyDetailSerializer
+
+
+JOURNEY_URL = reverse("stations:journey-list")
+
+
+class RouteKeyTests(TestCase):
+    def setUp(self):
+        self.kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        self.lviv = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+        self.route = Route.objects.create(source=self.kyiv, destination=self.lviv, distance=540)
+
+    def test_key_is_set_on_save(self):
+        self.assertEqual(Route.objects.get(pk=self.route.pk).key, "Kyiv -> Lviv")
+
+    def test_key_follows_station_rename(self):
+        self.lviv.name = "Lemberg"
+        self.lviv.save()
+
+        self.route.refresh_from_db()
+        self.assertEqual(self.route.key, "Kyiv -> Lemberg")
+
+    def test_key_follows_changed_destination(self):
+        odesa = Station.objects.create(name="Odesa", latitude=46.48, longitude=30.72)
+        self.route.destination = odesa
+        self.route.save(update_fields=["destination"])
+
+        self.route.refresh_from_db()
+        self.assertEqual(self.route.key, "Kyiv -> Odesa")
+
+    def test_resolve_keys_uses_one_query(self):
+        back = Route.objects.create(source=self.lviv, destination=self.kyiv, distance=540)
+
+        with self.assertNumQueries(1):
+            resolved = Route.resolve_keys(["Kyiv -> Lviv", "Lviv -> Kyiv", "Kyiv -> Odesa"])
+
+        self.assertEqual(
+            {key: [route.pk for route in routes] for key, routes in resolved.items()},
+            {"Kyiv -> Lviv": [self.route.pk], "Lviv -> Kyiv": [back.pk]},
+        )
+
+    def test_detail_serializer_writes_route_by_key(self):
+        serializer = JourneyDetailSerializer(data={"route": "Kyiv -> Lviv"}, partial=True)
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["route"], self.route)
+
+    def test_detail_serializer_rejects_unknown_and_ambiguous_keys(self):
+        Route.objects.create(source=self.kyiv, destination=self.lviv, distance=550)
+
+        for key in ("Kyiv -> Odesa", "Kyiv -> Lviv"):
+            serializer = JourneyDetailSerializer(data={"route": key}, partial=True)
+            self.assertFalse(serializer.is_valid())
+            self.assertIn("route", serializer.errors)
+
+
+class JourneyBatchCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="<EMAIL>",
+                password="<PASSWORD>",
+                is_staff=True,
+            )
+        )
+        self.train = Train.objects.create(name="Intercity", cargo=2, places_in_cargo=10)
+        self.crew = Crew.objects.create(first_name="Ivan", last_name="Franko")
+        self.stations = [
+            Station.objects.create(name=f"Station {number}", latitude=50, longitude=30 + number)
+            for number in range(6)
+        ]
+        self.routes = [
+            Route.objects.create(source=source, destination=destination, distance=100)
+            for source, destination in zip(self.stations, self.stations[1:])
+        ]
+
+    def payload(self, route):
+        return {
+            "route": route,
+            "train": self.train.pk,
+            "crew": [self.crew.pk],
+            "departure_time": "2026-01-01T08:00:00Z",
+            "arrival_time": "2026-01-01T13:00:00Z",
+        }
+
+    def route_lookups(self, queries):
+        return [
+            query["sql"] for query in queries
+            if query["sql"].startswith("SELECT") and '"stations_route"' in query["sql"].split("FROM")[1]
+        ]
+
+    def test_batch_resolves_all_route_keys_at_once(self):
+        payload = [self.payload(route.key) for route in self.routes]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(
+            [journey["route"] for journey in response.data],
+            [route.pk for route in self.routes],
+        )
+        self.assertEqual(Journey.objects.count(), len(self.routes))
+        self.assertEqual(len(self.route_lookups(queries.captured_queries)), 1)
+
+    def test_batch_mixes_route_ids_and_keys(self):
+        payload = [self.payload(self.routes[0].pk), self.payload(self.routes[1].key)]
+
+        response = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(
+            [journey["route"] for journey in response.data],
+            [self.routes[0].pk, self.routes[1].pk],
+        )
+
+    def test_batch_with_unknown_key_creates_nothing(self):
+        payload = [self.payload(self.routes[0].key), self.payload("Station 5 -> Station 0")]
+
+        response = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("route", response.data[1])
+        self.assertFalse(Journey.objects.exists())
+
+    def test_single_journey_accepts_route_id(self):
+        response = self.client.post(JOURNEY_URL, self.payload(self.routes[0].pk), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(response.data["route"], self.routes[0].pk)
+
+
+class RouteKeyFixtureTests(TestCase):
+    fixtures = ["initial_data"]
+
+    def test_loaded_routes_have_keys(self):
+        for route in Route.objects.select_related("source", "destination"):
+            self.assertEqual(route.key, f"{route.source.name} -> {route.destination.name}")
+
+    def test_loaded_route_resolves_by_key(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="<EMAIL>",
+                password="<PASSWORD>",
+                is_staff=True,
+            )
+        )
+        journey = Journey.objects.select_related("route").first()
+        payload = {
+            "route": journey.route.key,
+            "train": journey.train_id,
+            "crew": list(journey.crew.values_list("pk", flat=True)),
+            "departure_time": "2026-01-01T08:00:00Z",
+            "arrival_time": "2026-01-01T13:00:00Z",
+        }
+
+        detail = client.get(reverse("stations:journey-detail", kwargs={"pk": journey.pk}))
+        created = client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(journey.route.key, "Kyiv Central -> Lviv Main")
+        self.assertEqual(detail.data["route"], journey.route.key)
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED, created.data)
+        self.assertEqual(created.data["route"], journey.route_id)
@@ -0,0 +1,140 @@
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Ticket
+from stations.tests.test_journey_api import sample_journey
+
+
+JOURNEY_URL = reverse("stations:journey-list")
+ORDER_URL = reverse("stations:order-list")
+
+
+def hold_url(journey_id):
+    return reverse("stations:journey-hold", kwargs={"pk": journey_id})
+
+
+class SeatHoldApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="<OTHER_EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def hold(self, seats, seconds=60):
+        return self.client.post(
+            hold_url(self.journey.id),
+            {
+                "seats": [
+                    {"cargo_number": cargo_number, "seat_number": seat_number}
+                    for cargo_number, seat_number in seats
+                ],
+                "seconds": seconds,
+            },
+            format="json",
+        )
+
+    def test_hold_reduces_availability(self):
+        response = self.hold([(1, 1), (1, 2)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        journeys = self.client.get(JOURNEY_URL).data["results"]
+        self.assertEqual(journeys[0]["tickets_available"], 18)
+        detail = self.client.get(
+            reverse("stations:journey-detail", kwargs={"pk": self.journey.id})
+        )
+        self.assertEqual(
+            detail.data["taken_seats"],
+            [{"cargo_number": 1, "seat_number": 1}, {"cargo_number": 1, "seat_number": 2}],
+        )
+
+    def test_held_seat_cannot_be_booked_by_others(self):
+        self.hold([(1, 1)])
+        self.client.force_authenticate(user=self.other_user)
+
+        booking = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"cargo_number": 1, "seat_number": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+        second_hold = self.hold([(1, 1)])
+
+        self.assertEqual(booking.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(second_hold.status_code, status.HTTP_409_CONFLICT)
+
+    def test_order_from_hold(self):
+        hold_id = self.hold([(2, 4), (2, 5)]).data["hold"]
+
+        response = self.client.post(ORDER_URL, {"hold": hold_id}, format="json")
+        reused = self.client.post(ORDER_URL, {"hold": hold_id}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(Ticket.objects.values_list("cargo_number", "seat_number")), {(2, 4), (2, 5)}
+        )
+        self.assertEqual(reused.status_code, status.HTTP_400_BAD_REQUEST)
+        journeys = self.client.get(JOURNEY_URL).data["results"]
+        self.assertEqual(journeys[0]["tickets_available"], 18)
+
+    def test_order_from_hold_of_other_user(self):
+        hold_id = self.hold([(1, 1)]).data["hold"]
+        self.client.force_authenticate(user=self.other_user)
+
+        response = self.client.post(ORDER_URL, {"hold": hold_id}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_expired_hold_frees_seats(self):
+        self.hold([(1, 1)], seconds=30)
+
+        with mock.patch("stations.holds.time.time", return_value=time.time() + 31):
+            response = self.hold([(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_hold_taken_seat(self):
+        self.client.post(
+            ORDER_URL,
+            {"tickets": [{"cargo_number": 1, "seat_number": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+
+        response = self.hold([(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_hold_requires_booking_permission(self):
+        customer = get_user_model().objects.create_user(
+            email="<THIRD_EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.client.force_authenticate(user=customer)
+
+        response = self.hold([(1, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(JOURNEY_URL).data["results"][0]["tickets_available"], 20)
+
+    def test_hold_size_is_capped(self):
+        response = self.hold([(1, seat_number) for seat_number in range(1, settings.SEAT_HOLD_MAX_SEATS + 1)] + [(2, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", response.data)
@@ -0,0 +1,161 @@
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.distance import haversine_km
+from stations.geo import StationIndex
+from stations.models import Route, Station
+
+
+NEARBY_URL = reverse("stations:station-nearby")
+WITHIN_URL = reverse("stations:station-within")
+ROUTE_URL = reverse("stations:route-list")
+
+KYIV = (50.45, 30.52)
+
+
+class HaversineTests(SimpleTestCase):
+    def test_kyiv_lviv(self):
+        self.assertAlmostEqual(float(haversine_km(50.45, 30.52, 49.84, 24.03)), 467.3, delta=0.5)
+
+    def test_vectorised(self):
+        distances = haversine_km(0, 0, [0, 0, 1], [0, 1, 0])
+        self.assertEqual(len(distances), 3)
+        self.assertEqual(distances[0], 0)
+        self.assertAlmostEqual(distances[1], distances[2], places=6)
+
+
+class StationIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = StationIndex([
+            (1, "Kyiv", 50.45, 30.52),
+            (2, "Lviv", 49.84, 24.03),
+            (3, "Odesa", 46.48, 30.72),
+            (4, "Fairbanks", 64.84, -147.72),
+            (5, "Anadyr", 64.73, 177.51),
+        ])
+
+    def test_nearest_sorted_by_distance(self):
+        stations = self.index.nearest(*KYIV, limit=3)
+        self.assertEqual([station["id"] for station in stations], [1, 3, 2])
+        self.assertEqual(stations[0]["distance"], 0)
+
+    def test_nearest_within_radius(self):
+        stations = self.index.nearest(*KYIV, limit=10, radius=450)
+        self.assertEqual([station["id"] for station in stations], [1, 3])
+
+    def test_nearest_without_radius_measures_a_band(self):
+        rng = np.random.default_rng(0)
+        latitudes = rng.uniform(44, 52, 5000)
+        longitudes = rng.uniform(22, 40, 5000)
+        index = StationIndex(
+            (station_id, f"Station {station_id}", latitude, longitude)
+            for station_id, (latitude, longitude) in enumerate(zip(latitudes, longitudes))
+        )
+
+        with mock.patch("stations.geo.haversine_km", wraps=haversine_km) as measure:
+            stations = index.nearest(*KYIV, limit=10)
+
+        distances = haversine_km(*KYIV, latitudes, longitudes)
+        self.assertEqual(
+            [station["id"] for station in stations],
+            np.lexsort((np.arange(5000), distances))[:10].tolist(),
+        )
+        self.assertLess(max(len(call.args[2]) for call in measure.call_args_list), 1000)
+
+    def test_nearest_more_than_indexed(self):
+        stations = self.index.nearest(*KYIV, limit=10)
+        self.assertEqual([station["id"] for station in stations], [1, 3, 2, 5, 4])
+
+    def test_empty_index(self):
+        self.assertEqual(StationIndex([]).nearest(*KYIV, limit=5, radius=100), [])
+
+    def test_within_box(self):
+        stations = self.index.within(45, 25, 51, 31)
+        self.assertEqual([station["id"] for station in stations], [1, 3])
+
+    def test_within_box_across_antimeridian(self):
+        stations = self.index.within(60, 170, 70, -140)
+        self.assertEqual([station["id"] for station in stations], [4, 5])
+
+
+class StationGeoApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(email="<EMAIL>", password="<PASSWORD>")
+        self.client.force_authenticate(user=user)
+        self.kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        self.lviv = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+    def test_nearby(self):
+        response = self.client.get(NEARBY_URL, {"lat": 50.4, "lon": 30.5, "radius": 100})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([station["id"] for station in response.data], [self.kyiv.id])
+        self.assertLess(response.data[0]["distance"], 10)
+
+    def test_index_refreshed_when_station_changes(self):
+        self.client.get(NEARBY_URL, {"lat": 49.8, "lon": 24.0, "limit": 1})
+        odesa = Station.objects.create(name="Odesa", latitude=49.8, longitude=24.0)
+
+        response = self.client.get(NEARBY_URL, {"lat": 49.8, "lon": 24.0, "limit": 1})
+
+        self.assertEqual(response.data[0]["id"], odesa.id)
+
+    def test_nearby_invalid_coordinates(self):
+        response = self.client.get(NEARBY_URL, {"lat": 95, "lon": 30})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("lat", response.data)
+
+    def test_within(self):
+        response = self.client.get(
+            WITHIN_URL, {"min_lat": 49, "min_lon": 20, "max_lat": 50, "max_lon": 25}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([station["name"] for station in response.data], ["Lviv"])
+
+
+class RouteDistanceTests(TestCase):
+    def setUp(self):
+        self.kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        self.lviv = Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+    def test_distance_computed_when_omitted(self):
+        route = Route.objects.create(source=self.kyiv, destination=self.lviv)
+
+        self.assertEqual(route.distance, 467.3)
+
+    def test_given_distance_kept(self):
+        route = Route.objects.create(source=self.kyiv, destination=self.lviv, distance=540)
+
+        self.assertEqual(route.distance, 540)
+
+    def test_recompute_command(self):
+        wrong = Route.objects.create(source=self.kyiv, destination=self.lviv, distance=540)
+        right = Route.objects.create(source=self.lviv, destination=self.kyiv)
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(email="<EMAIL>", password="<PASSWORD>")
+        )
+        client.get(ROUTE_URL)
+        out = StringIO()
+
+        call_command("recompute_route_distances", batch_size=1, stdout=out)
+
+        self.assertIn("Updated the distance of 1 of 2 routes", out.getvalue())
+        wrong.refresh_from_db()
+        right.refresh_from_db()
+        self.assertEqual(wrong.distance, 467.3)
+        self.assertEqual(right.distance, 467.3)
+        distances = [route["distance"] for route in client.get(ROUTE_URL).data["results"]]
+        self.assertEqual(distances, [467.3, 467.3])
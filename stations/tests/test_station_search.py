@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from stations.models import Station
+from stations.search import StationNameIndex, normalize, prefix_distance
+
+
+SEARCH_URL = reverse("stations:station-search")
+
+
+def names(stations):
+    return [station["name"] for station in stations]
+
+
+class StationNameIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = StationNameIndex([
+            (1, "Kyiv-Pasazhyrskyi", 50.44, 30.49),
+            (2, "Lviv", 49.84, 24.03),
+            (3, "Kyiv Darnytsia", 50.45, 30.61),
+            (4, "Ódesa Holovna", 46.47, 30.74),
+            (5, "Kryvyi Rih", 47.91, 33.39),
+        ])
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  Ódesa-Holovna "), "odesa holovna")
+
+    def test_prefix_distance(self):
+        self.assertEqual(prefix_distance("kyvi", "kyiv darnytsia", 1), 1)
+        self.assertEqual(prefix_distance("odes", "odesa", 1), 0)
+        self.assertEqual(prefix_distance("xxxx", "kyiv", 1), 2)
+
+    def test_prefix_of_name(self):
+        self.assertEqual(names(self.index.search("ky", 10)), ["Kyiv Darnytsia", "Kyiv-Pasazhyrskyi"])
+        self.assertEqual(names(self.index.search("KYIV D", 1)), ["Kyiv Darnytsia"])
+
+    def test_prefix_of_later_word(self):
+        self.assertEqual(names(self.index.search("holov", 10)), ["Ódesa Holovna"])
+
+    def test_accents_ignored(self):
+        self.assertEqual(names(self.index.search("ódesa", 10)), ["Ódesa Holovna"])
+
+    def test_limit(self):
+        self.assertEqual(len(self.index.search("ky", 1)), 1)
+
+    def test_typo_tolerance(self):
+        self.assertEqual(names(self.index.search("lvvi", 10)), ["Lviv"])
+        self.assertEqual(names(self.index.search("odeas hol", 10)), ["Ódesa Holovna"])
+
+    def test_no_typos_for_short_queries(self):
+        self.assertEqual(self.index.search("lb", 10), [])
+
+
+class StationSearchApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(email="<EMAIL>", password="<PASSWORD>")
+        self.client.force_authenticate(user=user)
+        self.kyiv = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+    def test_search(self):
+        response = self.client.get(SEARCH_URL, {"q": "ky"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{"id": self.kyiv.id, "name": "Kyiv", "latitude": 50.45, "longitude": 30.52}],
+        )
+
+    def test_index_refreshed_when_station_changes(self):
+        self.client.get(SEARCH_URL, {"q": "kh"})
+        Station.objects.create(name="Kharkiv", latitude=49.99, longitude=36.23)
+
+        response = self.client.get(SEARCH_URL, {"q": "kh"})
+
+        self.assertEqual(names(response.data), ["Kharkiv"])
+
+    def test_query_required(self):
+        response = self.client.get(SEARCH_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(STATION_SEARCH_MAX_INDEXED=1)
+    def test_database_fallback(self):
+        Station.objects.create(name="Kyiv Darnytsia", latitude=50.45, longitude=30.61)
+
+        response = self.client.get(SEARCH_URL, {"q": "KY"})
+
+        self.assertEqual(names(response.data), ["Kyiv", "Kyiv Darnytsia"])
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from railwayAPI.throttling import ScopedSlidingWindowThrottle, UserSlidingWindowThrottle
+from stations.tests.test_journey_api import sample_journey
+from stations.tests.test_order_api import tickets_payload
+
+
+JOURNEY_URL = reverse("stations:journey-list")
+ORDER_URL = reverse("stations:order-list")
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.journey = sample_journey()
+
+    def book(self, seat_number):
+        return self.client.post(
+            ORDER_URL, tickets_payload(self.journey, [(1, seat_number)]), format="json"
+        )
+
+    def test_booking_limited_separately_from_browsing(self):
+        rates = {"user": "1000/day", "booking": "2/minute"}
+        with mock.patch.object(ScopedSlidingWindowThrottle, "THROTTLE_RATES", rates), \
+                mock.patch.object(UserSlidingWindowThrottle, "THROTTLE_RATES", rates):
+            self.assertEqual(self.book(1).status_code, status.HTTP_201_CREATED)
+            self.assertEqual(self.book(2).status_code, status.HTTP_201_CREATED)
+            throttled = self.book(3)
+            browsing = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", throttled)
+        self.assertEqual(browsing.status_code, status.HTTP_200_OK)
+
+    def test_previous_window_decays(self):
+        rates = {"user": "10/minute"}
+        with mock.patch.object(UserSlidingWindowThrottle, "THROTTLE_RATES", rates), \
+                mock.patch.object(UserSlidingWindowThrottle, "timer") as timer:
+            timer.return_value = 6000.0
+            for _ in range(10):
+                self.assertEqual(self.client.get(JOURNEY_URL).status_code, status.HTTP_200_OK)
+
+            # A quarter into the next window 75% of the previous one still counts.
+            timer.return_value = 6075.0
+            self.assertEqual(self.client.get(JOURNEY_URL).status_code, status.HTTP_200_OK)
+            self.assertEqual(self.client.get(JOURNEY_URL).status_code, status.HTTP_200_OK)
+            throttled = self.client.get(JOURNEY_URL)
+
+            timer.return_value = 6105.0
+            allowed = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
+
+    def test_throttled_retries_are_not_counted(self):
+        rates = {"user": "10/minute"}
+        with mock.patch.object(UserSlidingWindowThrottle, "THROTTLE_RATES", rates), \
+                mock.patch.object(UserSlidingWindowThrottle, "timer") as timer:
+            timer.return_value = 6000.0
+            for _ in range(10):
+                self.client.get(JOURNEY_URL)
+
+            timer.return_value = 6030.0
+            retries = [self.client.get(JOURNEY_URL) for _ in range(20)]
+
+            # 75% of the ten allowed requests still count a quarter into the next window.
+            timer.return_value = 6075.0
+            allowed = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(
+            {response.status_code for response in retries}, {status.HTTP_429_TOO_MANY_REQUESTS}
+        )
+        self.assertEqual(retries[-1]["Retry-After"], "30")
+        self.assertEqual(allowed.status_code, status.HTTP_200_OK)
+
+    def test_constant_memory_per_key(self):
+        cache = caches[settings.THROTTLE_CACHE]
+        for _ in range(5):
+            self.client.get(JOURNEY_URL)
+
+        throttle = UserSlidingWindowThrottle()
+        window = int(throttle.timer() // throttle.duration)
+        key = f"throttle_user_{self.user.pk}:{window}"
+        self.assertEqual(cache.get(key), 5)
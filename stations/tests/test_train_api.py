@@ -74,6 +74,12 @@ class AuthTrainApiTests(TestCase):
         self.assertIn(serializer_with_train_type.data, response.data["results"])
         self.assertNotIn(serializer_without_train_type.data, response.data["results"])
 
+    def test_filter_trains_by_invalid_train_type(self):
+        response = self.client.get(TRAIN_URL, {"train_type": "1,express"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("train_type", response.data)
+
     def test_retrieve_train_detail(self):
         train = sample_train()
         train_type = TrainType.objects.create(name="test type")
@@ -0,0 +1,19 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from stations.management.commands.wait_for_migrations import Command
+
+
+class WaitForMigrationsTests(TestCase):
+    def test_ready_when_all_migrations_applied(self):
+        out = StringIO()
+        call_command("wait_for_migrations", timeout=0, stdout=out)
+        self.assertIn("Database is ready", out.getvalue())
+
+    def test_fails_after_timeout_with_pending_migrations(self):
+        with mock.patch.object(Command, "pending_migrations", return_value=[object()]):
+            with self.assertRaisesMessage(CommandError, "1 migrations not applied"):
+                call_command("wait_for_migrations", timeout=0, stdout=StringIO())
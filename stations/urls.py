@@ -3,7 +3,7 @@ from rest_framework import routers
 
 from stations.models import Journey
 from stations.views import StationViewSet, CrewViewSet, TrainTypeViewSet, TrainViewSet, RouteViewSet, JourneyViewSet, \
-    TicketViewSet, OrderViewSet
+    TicketViewSet, OrderViewSet, MetricsView
 
 app_name = "stations"
 
@@ -18,4 +18,7 @@ router.register("tickets", TicketViewSet)
 router.register("orders", OrderViewSet)
 
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+]
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from stations.replicas import read_from_primary
+
+VERSION_KEY_PREFIX = "stations:version:"
+
+
+def get_version(name):
+    """Return the current version of a named data set.
+
+    A missing key is seeded with a timestamp rather than 1, so a version
+    that was evicted from the cache never repeats an older value.
+    """
+    return cache.get_or_set(VERSION_KEY_PREFIX + name, time.time_ns, None)
+
+
+def peek_version(name):
+    """Return the current version of a data set, or None without seeding it."""
+    return cache.get(VERSION_KEY_PREFIX + name)
+
+
+def get_versions(names):
+    """Return ``{name: version}`` for several data sets with one cache read."""
+    keys = {VERSION_KEY_PREFIX + name: name for name in names}
+    versions = {keys[key]: version for key, version in cache.get_many(keys).items()}
+    missing = [name for name in names if name not in versions]
+    for name in missing:
+        versions[name] = get_version(name)
+    return versions
+
+
+def bump_version(name):
+    try:
+        return cache.incr(VERSION_KEY_PREFIX + name)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(VERSION_KEY_PREFIX + name, version, None)
+        return version
+
+
+def invalidate(name):
+    """Bump a version for a write made in the current transaction.
+
+    The version is bumped right away, so later reads in this transaction
+    see the change, and again on commit, because readers in other
+    transactions may have cached pre-commit data under the first bump.
+    """
+    bump_version(name)
+    transaction.on_commit(lambda: bump_version(name))
+
+
+class VersionedSnapshot:
+    """In-process value that is rebuilt whenever its named version changes.
+
+    Every worker keeps its own copy and only compares a version number
+    with the shared cache on access, so a write in one process reaches
+    the others on their next lookup. Builds always read from the primary
+    database, so a lagging replica cannot be stored under a new version.
+    """
+
+    def __init__(self, name, build):
+        self.name = name
+        self.build = build
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+
+    def get(self):
+        version = get_version(self.name)
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    with read_from_primary():
+                        self._value = self.build()
+                    self._version = version
+        return self._value
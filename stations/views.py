@@ -1,44 +1,125 @@
-from django.db.models import F, Count
+import base64
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from rest_framework import mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
+from stations import holds, metrics
+from stations.booking import hold_seats
+from stations.caching import CachedListMixin, ConditionalGetMixin, ConditionalRetrieveMixin, hit_ratio
+from stations.geo import station_index
 from stations.models import Station, Crew, TrainType, Train, Route, Journey, Ticket, Order
+from stations.pagination import JourneyPagination, OrderPagination, TicketPagination
 from stations.permissions import IsAdminOrIfAuthenticatedReadOnly
+from stations.planner import timetable
+from stations.replicas import ReplicaReadMixin
+from stations.search import search_stations
 from stations.serializers import StationSerializer, CrewSerializer, TrainTypeSerializer, TrainSerializer, \
     RouteSerializer, JourneyListSerializer, JourneyDetailSerializer, JourneySerializer, TicketSerializer, \
-    OrderSerializer, OrderListSerializer, TrainImageSerializer
+    OrderSerializer, OrderListSerializer, TrainImageSerializer, JourneyPlanQuerySerializer, \
+    JourneyPlanLegSerializer, JourneySeatMapSerializer, SeatHoldSerializer, NearbyStationSerializer, \
+    StationNearbyQuerySerializer, StationWithinQuerySerializer, StationSearchQuerySerializer
+from stations.versions import get_version, peek_version
 
 
-class StationViewSet(GenericViewSet,
+def _params_to_ints(name, query_string):
+    try:
+        return [int(str_id) for str_id in query_string.split(",")]
+    except ValueError:
+        raise ValidationError({name: "Enter a comma-separated list of ids."})
+
+
+class StationViewSet(ReplicaReadMixin,
+                     ConditionalGetMixin,
+                     CachedListMixin,
+                     GenericViewSet,
                      mixins.CreateModelMixin,
                      mixins.ListModelMixin,):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Station,)
 
-
-class CrewViewSet(GenericViewSet,
+    def get_serializer_class(self):
+        if self.action == "nearby":
+            return NearbyStationSerializer
+        return StationSerializer
+
+    @extend_schema(parameters=[StationNearbyQuerySerializer])
+    @action(methods=["GET"], detail=False, url_path="nearby")
+    def nearby(self, request):
+        """Stations closest to a point, nearest first, optionally within a radius."""
+        query = StationNearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        stations = station_index.get().nearest(
+            params["lat"], params["lon"], params["limit"], params.get("radius")
+        )
+        return Response(self.get_serializer(stations, many=True).data)
+
+    @extend_schema(parameters=[StationSearchQuerySerializer])
+    @action(methods=["GET"], detail=False, url_path="search")
+    def search(self, request):
+        """Stations whose name or a word of it starts with ``q``, tolerating typos."""
+        query = StationSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        stations = search_stations(params["q"], params["limit"])
+        return Response(self.get_serializer(stations, many=True).data)
+
+    @extend_schema(parameters=[StationWithinQuerySerializer])
+    @action(methods=["GET"], detail=False, url_path="within")
+    def within(self, request):
+        """Stations inside a latitude/longitude bounding box."""
+        query = StationWithinQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        stations = station_index.get().within(
+            params["min_lat"], params["min_lon"], params["max_lat"], params["max_lon"]
+        )
+        return Response(self.get_serializer(stations, many=True).data)
+
+
+class CrewViewSet(ConditionalGetMixin,
+                  CachedListMixin,
+                     GenericViewSet,
                      mixins.CreateModelMixin,
                      mixins.ListModelMixin,):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Crew,)
 
 
-class TrainTypeViewSet(GenericViewSet,
+class TrainTypeViewSet(ConditionalGetMixin,
+                       CachedListMixin,
+                     GenericViewSet,
                      mixins.CreateModelMixin,
                      mixins.ListModelMixin,):
     queryset = TrainType.objects.all()
     serializer_class = TrainTypeSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (TrainType,)
 
 
-class TrainViewSet(ModelViewSet):
+class TrainViewSet(ConditionalRetrieveMixin, CachedListMixin, ModelViewSet):
     queryset = Train.objects.all().select_related("train_type")
     serializer_class = TrainSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    cache_models = (Train, TrainType)
 
     @action(methods=["POST"], detail=True, url_path="upload-image")
     def upload_image(self, request, pk=None):
@@ -55,7 +136,7 @@ class TrainViewSet(ModelViewSet):
         train_type = self.request.query_params.get("train_type")
 
         if train_type:
-            train_type_ids = [int(str_id) for str_id in train_type.split(",")]
+            train_type_ids = _params_to_ints("train_type", train_type)
             queryset = queryset.filter(train_type__id__in=train_type_ids)
 
         return queryset
@@ -68,25 +149,29 @@ class TrainViewSet(ModelViewSet):
         return TrainSerializer
 
 
-class RouteViewSet(GenericViewSet,
-                     mixins.CreateModelMixin,
-                     mixins.ListModelMixin,):
+class RouteViewSet(ReplicaReadMixin,
+                   ConditionalGetMixin,
+                   CachedListMixin,
+                   GenericViewSet,
+                   mixins.CreateModelMixin,
+                   mixins.ListModelMixin,):
     serializer_class = RouteSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
     queryset = Route.objects.all()
+    cache_models = (Route, Station)
 
     def get_queryset(self):
         queryset = Route.objects.all().select_related("source", "destination")
         sources = self.request.query_params.get("source")
 
         if sources:
-            source_ids = [int(str_id) for str_id in sources.split(",")]
+            source_ids = _params_to_ints("source", sources)
             queryset = queryset.filter(source__id__in=source_ids)
 
         return queryset
 
 
-class JourneyViewSet(ModelViewSet):
+class JourneyViewSet(ReplicaReadMixin, ConditionalRetrieveMixin, ModelViewSet):
     queryset = Journey.objects.select_related(
         "train__train_type",
         "route__source",
@@ -95,36 +180,197 @@ class JourneyViewSet(ModelViewSet):
         "crew"
     )
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = JourneyPagination
+    throttle_scope = None
+    cache_models = (Route, Station, Train, TrainType, Crew)
+    etag_actions = ("retrieve",)
+
+    def get_etag_parts(self, request):
+        journey_id = self.kwargs[self.lookup_field]
+        version = peek_version(Journey.version_name(journey_id))
+        if version is None:
+            # Only seed version keys of journeys that exist, so requests for
+            # made-up ids (404s) cannot fill the shared cache.
+            journey_id = self.get_object().pk
+            version = get_version(Journey.version_name(journey_id))
+        return [
+            *super().get_etag_parts(request),
+            f"journey={version}",
+            *sorted(holds.journey_holds([journey_id])[journey_id]),
+        ]
+
+    @staticmethod
+    def _param_to_datetime(name, value):
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValidationError({name: "Enter a valid ISO 8601 date and time."})
+        return parsed
 
     def get_queryset(self):
         queryset = self.queryset
         if self.action == "list":
-            queryset = (
-                queryset
-                .select_related("train")
-                .annotate(tickets_available=F("train__places_in_cargo") - Count("tickets"))
-            ).order_by("id")
+            # The list shows names built by the database, so none of the
+            # related rows (nor the seat map) has to be loaded.
+            queryset = Journey.annotate_list_fields(
+                queryset.select_related(None).prefetch_related(None)
+            ).only("id", "departure_time", "arrival_time")
+            source = self.request.query_params.get("source")
+            destination = self.request.query_params.get("destination")
+            route = self.request.query_params.get("route")
+            departure_after = self.request.query_params.get("departure_after")
+            departure_before = self.request.query_params.get("departure_before")
+
+            if source:
+                queryset = queryset.filter(
+                    route__source__id__in=_params_to_ints("source", source)
+                )
+            if destination:
+                queryset = queryset.filter(
+                    route__destination__id__in=_params_to_ints("destination", destination)
+                )
+            if route:
+                queryset = queryset.filter(route__id__in=_params_to_ints("route", route))
+            if departure_after:
+                queryset = queryset.filter(
+                    departure_time__gte=self._param_to_datetime("departure_after", departure_after)
+                )
+            if departure_before:
+                queryset = queryset.filter(
+                    departure_time__lt=self._param_to_datetime("departure_before", departure_before)
+                )
         return queryset
 
+    @action(methods=["GET"], detail=False, url_path="plan")
+    def plan(self, request):
+        """Earliest-arrival itinerary between two stations, with transfers."""
+        query = JourneyPlanQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        legs = timetable.get().earliest_arrival(
+            params["source"],
+            params["destination"],
+            params.get("departure_after") or timezone.now(),
+            min_transfer=timedelta(minutes=params["min_transfer"]),
+            horizon=timedelta(hours=params["max_hours"]),
+        )
+        if legs is None:
+            return Response(
+                {"detail": "No connection found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({
+            "departure_time": legs[0]["departure_time"],
+            "arrival_time": legs[-1]["arrival_time"],
+            "transfers": len(legs) - 1,
+            "legs": self.get_serializer(legs, many=True).data,
+        })
+
+    @action(methods=["GET"], detail=True, url_path="seat-map")
+    def seat_map(self, request, pk=None):
+        """Taken seats of a journey, as a base64 bitset and as a list."""
+        journey = self.get_object()
+        seat_map = journey.get_seat_map()
+        serializer = self.get_serializer({
+            "cargo": seat_map.cargo,
+            "places_in_cargo": seat_map.places_in_cargo,
+            "seat_map": base64.b64encode(bytes(seat_map)).decode(),
+            "taken_seats": [
+                {"cargo_number": cargo_number, "seat_number": seat_number}
+                for cargo_number, seat_number in seat_map.taken_seats()
+            ],
+            "held_seats": [
+                {"cargo_number": cargo_number, "seat_number": seat_number}
+                for cargo_number, seat_number in sorted(holds.held_seats([journey.pk])[journey.pk])
+            ],
+        })
+        return Response(serializer.data)
+
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="hold",
+        # Only users who can turn a hold into an order may hold seats.
+        permission_classes=(IsAdminOrIfAuthenticatedReadOnly,),
+        throttle_scope="booking",
+    )
+    def hold(self, request, pk=None):
+        """Hold free seats for a few minutes; pass the hold id to a new order."""
+        journey = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        seats = [
+            (seat["cargo_number"], seat["seat_number"])
+            for seat in serializer.validated_data["seats"]
+        ]
+        with transaction.atomic():
+            hold_id, hold = hold_seats(
+                journey.pk, seats, serializer.validated_data["seconds"], request.user.pk
+            )
+        serializer = self.get_serializer({
+            "hold": hold_id,
+            "seats": [
+                {"cargo_number": cargo_number, "seat_number": seat_number}
+                for cargo_number, seat_number in seats
+            ],
+            "expires_at": datetime.fromtimestamp(hold["expires_at"], dt_timezone.utc),
+        })
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def get_serializer_class(self):
         if self.action == "list":
             return JourneyListSerializer
         elif self.action == "retrieve":
             return JourneyDetailSerializer
+        elif self.action == "plan":
+            return JourneyPlanLegSerializer
+        elif self.action == "seat_map":
+            return JourneySeatMapSerializer
+        elif self.action == "hold":
+            return SeatHoldSerializer
         return JourneySerializer
 
+    def get_serializer(self, *args, **kwargs):
+        if self.action == "create" and isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
 
 class TicketViewSet(ModelViewSet):
     queryset = Ticket.objects.all().select_related("journey", "order")
     serializer_class = TicketSerializer
+    pagination_class = TicketPagination
+
+    # The ticket row and the seat map of its journey change together.
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
 
-class OrderViewSet(mixins.ListModelMixin,
+
+class OrderViewSet(ReplicaReadMixin,
+                   mixins.ListModelMixin,
                    mixins.CreateModelMixin,
                    GenericViewSet,):
     queryset = Order.objects.all().select_related("user")
     serializer_class = OrderSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    pagination_class = OrderPagination
+
+    @property
+    def throttle_scope(self):
+        """Booking has its own rate, listing orders is limited like browsing."""
+        return "booking" if self.action == "create" else None
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -132,9 +378,23 @@ class OrderViewSet(mixins.ListModelMixin,
         return OrderSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        queryset = Order.objects.filter(user_id=self.request.user.pk)
+        if self.action == "list":
+            queryset = queryset.prefetch_related("tickets__journey")
+        return queryset
+
+
+class MetricsView(APIView):
+    """Counters of the worker process that serves the request."""
 
+    permission_classes = (IsAdminUser,)
 
+    @extend_schema(responses=OpenApiTypes.OBJECT)
+    def get(self, request):
+        snapshot = metrics.snapshot()
+        snapshot["response_cache_hit_ratio"] = hit_ratio(snapshot["counters"])
+        snapshot["database_pools"] = metrics.database_pools()
+        return Response(snapshot)
@@ -0,0 +1,104 @@
+"""JWT authentication with a bounded cache of verified tokens.
+
+Checking a token's signature is the expensive part of authenticating a
+request, and clients send the same access token many times until it
+expires. ``verified_tokens`` remembers tokens that passed verification,
+keyed by a hash of the encoded token, and forgets them when they expire.
+Every worker process keeps its own cache of at most
+``VERIFIED_TOKEN_CACHE_SIZE`` tokens, least recently used first out.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from rest_framework_simplejwt import models
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import UntypedToken
+
+
+class TokenUser(models.TokenUser):
+    """``TokenUser`` whose id has the type of the user model's primary key.
+
+    simplejwt writes the user id claim as a string, and a string id would
+    not compare equal to foreign keys such as ``Order.user_id``.
+    """
+
+    @cached_property
+    def id(self):
+        return get_user_model()._meta.pk.to_python(self.token[jwt_settings.USER_ID_CLAIM])
+
+
+class VerifiedTokenCache:
+    def __init__(self):
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(raw_token, kind):
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return kind, hashlib.sha256(raw_token).digest()
+
+    def get(self, key):
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                return None
+            if token["exp"] <= time.time():
+                del self._tokens[key]
+                return None
+            self._tokens.move_to_end(key)
+            return token
+
+    def set(self, key, token):
+        with self._lock:
+            self._tokens[key] = token
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > settings.VERIFIED_TOKEN_CACHE_SIZE:
+                self._tokens.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def verify_token(raw_token):
+    """Validate a token of any type like ``UntypedToken``, through the cache."""
+    key = verified_tokens.key(raw_token, "untyped")
+    token = verified_tokens.get(key)
+    if token is None:
+        token = UntypedToken(raw_token)
+        verified_tokens.set(key, token)
+    return token
+
+
+class CachedTokenValidationMixin:
+    def get_validated_token(self, raw_token):
+        key = verified_tokens.key(raw_token, "auth")
+        token = verified_tokens.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            verified_tokens.set(key, token)
+        return token
+
+
+class CachedJWTAuthentication(CachedTokenValidationMixin, JWTAuthentication):
+    pass
+
+
+class CachedJWTStatelessUserAuthentication(
+    CachedTokenValidationMixin, JWTStatelessUserAuthentication
+):
+    pass
@@ -0,0 +1,11 @@
+"""drf-spectacular extensions for the authentication classes in this app."""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.CachedJWTAuthentication"
+
+
+class CachedJWTStatelessUserScheme(SimpleJWTScheme):
+    target_class = "user.authentication.CachedJWTStatelessUserAuthentication"
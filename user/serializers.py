@@ -1,6 +1,12 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenVerifySerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from user.authentication import verify_token
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -67,3 +73,53 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs['user'] = user
         return attrs
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    """Token pair carrying the claims read by stateless JWT authentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["is_staff"] = user.is_staff
+        return token
+
+
+class CachedTokenVerifySerializer(TokenVerifySerializer):
+    def validate(self, attrs):
+        verify_token(attrs["token"])
+        return {}
+
+
+class TokenBatchVerifyResultSerializer(serializers.Serializer):
+    valid = serializers.BooleanField()
+    detail = serializers.CharField(required=False)
+    token_type = serializers.CharField(required=False)
+    user_id = serializers.CharField(required=False)
+    exp = serializers.IntegerField(required=False)
+
+
+class TokenBatchVerifySerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.TOKEN_BATCH_VERIFY_MAX,
+        write_only=True,
+    )
+    results = TokenBatchVerifyResultSerializer(many=True, read_only=True)
+
+    def validate(self, attrs):
+        results = []
+        for raw_token in attrs["tokens"]:
+            try:
+                token = verify_token(raw_token)
+            except TokenError as error:
+                results.append({"valid": False, "detail": error.args[0]})
+            else:
+                results.append({
+                    "valid": True,
+                    "token_type": token.get(jwt_settings.TOKEN_TYPE_CLAIM),
+                    "user_id": token.get(jwt_settings.USER_ID_CLAIM),
+                    "exp": token["exp"],
+                })
+        return {"results": results}
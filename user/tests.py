@@ -1,3 +1,172 @@
-from django.test import TestCase
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from railwayAPI.throttling import ScopedSlidingWindowThrottle
+from stations.tests.test_journey_api import sample_journey
+from stations.tests.test_order_api import tickets_payload
+from user.authentication import VerifiedTokenCache, verified_tokens
+
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+VERIFY_URL = reverse("user:token_verify")
+BATCH_VERIFY_URL = reverse("user:token_verify_batch")
+ME_URL = reverse("user:manage_user")
+JOURNEY_URL = reverse("stations:journey-list")
+ORDER_URL = reverse("stations:order-list")
+
+
+class StatelessJWTTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.journey = sample_journey()
+
+    def authenticate(self, is_staff=False):
+        user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+            is_staff=is_staff,
+        )
+        response = self.client.post(
+            TOKEN_URL, {"email": "<EMAIL>", "password": "<PASSWORD>"}
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return user
+
+    def test_read_request_does_not_load_user(self):
+        self.authenticate()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"user_user"' in query["sql"] for query in queries))
+        self.assertIsInstance(response.renderer_context["request"].user.pk, int)
+
+    def test_is_staff_claim_allows_booking(self):
+        user = self.authenticate(is_staff=True)
+
+        response = self.client.post(
+            ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(user.orders.count(), 1)
+        self.assertEqual(len(self.client.get(ORDER_URL).data["results"]), 1)
+
+    def test_non_staff_cannot_book(self):
+        self.authenticate()
+
+        response = self.client.post(
+            ORDER_URL, tickets_payload(self.journey, [(1, 1)]), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_manage_user_loads_full_user(self):
+        self.authenticate()
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], "<EMAIL>")
+
+
+class VerifiedTokenCacheTests(TestCase):
+    def setUp(self):
+        verified_tokens.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="<EMAIL>",
+            password="<PASSWORD>",
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+
+    def test_signature_checked_once_per_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+        with mock.patch.object(
+            TokenBackend, "decode", autospec=True, side_effect=TokenBackend.decode
+        ) as decode:
+            for _ in range(3):
+                self.assertEqual(self.client.get(JOURNEY_URL).status_code, status.HTTP_200_OK)
+            self.client.post(VERIFY_URL, {"token": self.access})
+            self.client.post(VERIFY_URL, {"token": self.access})
+
+        # Once for authentication, once for the untyped verify endpoint.
+        self.assertEqual(decode.call_count, 2)
+
+    def test_verify_rejects_invalid_token(self):
+        response = self.client.post(VERIFY_URL, {"token": self.access[:-2]})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_batch_verify(self):
+        tokens = [self.access, str(self.refresh), "not-a-token"]
+
+        response = self.client.post(BATCH_VERIFY_URL, {"tokens": tokens}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [(result["valid"], result.get("token_type")) for result in results],
+            [(True, "access"), (True, "refresh"), (False, None)],
+        )
+        self.assertEqual(results[0]["user_id"], str(self.user.id))
+        self.assertIn("detail", results[2])
+
+    @override_settings(TOKEN_BATCH_VERIFY_MAX=100)
+    def test_batch_verify_limit(self):
+        response = self.client.post(
+            BATCH_VERIFY_URL, {"tokens": [self.access] * 101}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_verify_has_its_own_rate(self):
+        caches[settings.THROTTLE_CACHE].clear()
+        rates = {"anon": "1/day", "token_verify": "2/minute"}
+
+        with mock.patch.dict(ScopedSlidingWindowThrottle.THROTTLE_RATES, rates):
+            responses = [
+                self.client.post(BATCH_VERIFY_URL, {"tokens": [self.access]}, format="json")
+                for _ in range(3)
+            ]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_200_OK, status.HTTP_200_OK, status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+
+    def test_expired_tokens_are_dropped(self):
+        cache = VerifiedTokenCache()
+        cache.set("live", {"exp": time.time() + 60})
+        cache.set("expired", {"exp": time.time() - 1})
+
+        self.assertIsNotNone(cache.get("live"))
+        self.assertIsNone(cache.get("expired"))
+
+    @override_settings(VERIFIED_TOKEN_CACHE_SIZE=2)
+    def test_least_recently_used_token_evicted(self):
+        cache = VerifiedTokenCache()
+        exp = time.time() + 60
+        cache.set("a", {"exp": exp})
+        cache.set("b", {"exp": exp})
+        cache.get("a")
+        cache.set("c", {"exp": exp})
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
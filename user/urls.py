@@ -1,7 +1,7 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
-from user.views import CreateUserView, ManageUserView
+from user.views import CreateUserView, ManageUserView, TokenBatchVerifyView
 
 app_name = "user"
 
@@ -10,5 +10,6 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("token/verify/batch/", TokenBatchVerifyView.as_view(), name="token_verify_batch"),
     path("me/", ManageUserView.as_view(), name="manage_user")
 ]
\ No newline at end of file
@@ -1,9 +1,12 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.settings import api_settings
+from rest_framework_simplejwt.views import TokenViewBase
 
-from user.serializers import UserSerializer, AuthTokenSerializer
+from railwayAPI.throttling import ScopedSlidingWindowThrottle
+from user.serializers import UserSerializer, AuthTokenSerializer, TokenBatchVerifySerializer
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -15,9 +18,22 @@ class CreateTokenView(ObtainAuthToken):
    serializer_class = AuthTokenSerializer
 
 
+class TokenBatchVerifyView(TokenViewBase):
+   """Verify up to TOKEN_BATCH_VERIFY_MAX tokens; one result per token, in order."""
+
+   serializer_class = TokenBatchVerifySerializer
+   # Callers are anonymous gateways; the anon rate is meant for browsing users.
+   throttle_classes = (ScopedSlidingWindowThrottle,)
+   throttle_scope = "token_verify"
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
    serializer_class = UserSerializer
    permission_classes = (IsAuthenticated,)
 
    def get_object(self):
-      return self.request.user
+      user = self.request.user
+      if isinstance(user, get_user_model()):
+         return user
+      # Stateless JWT authentication only knows the id and claims of the user.
+      return get_user_model().objects.get(pk=user.pk)